@@ -2,107 +2,548 @@
 Action execution engine for DailyFlow.
 Handles running different types of actions.
 """
+import asyncio
+import logging
 import subprocess
 import webbrowser
-import time
 import os
+import shlex
+import shutil
 import sys
-from typing import Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
 from models import Action, ActionType
-from PySide6.QtWidgets import QMessageBox
-from PySide6.QtCore import QThread, Signal
-import pycaw.pycaw as pycaw
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+from PySide6.QtCore import QElapsedTimer, QObject, QRunnable, QThreadPool, Signal
 
 
-class ActionExecutor(QThread):
-    """Executes actions in a separate thread to avoid blocking the UI."""
+logger = logging.getLogger(__name__)
+
+
+# Actions that must run on their own, in order, between parallel groups
+BARRIER_ACTION_TYPES = (ActionType.DELAY, ActionType.SHOW_MESSAGE)
+
+# Upper bound on concurrent launches within a single group
+MAX_PARALLEL_ACTIONS = 8
+
+# Routines longer than this report progress in batches, at most every
+# PROGRESS_BATCH_INTERVAL_MS, to keep cross-thread signal traffic down
+PROGRESS_BATCH_THRESHOLD = 16
+PROGRESS_BATCH_INTERVAL_MS = 50
+
+# Cached IAudioEndpointVolume for the default speakers (see _get_volume_interface).
+# COM interfaces belong to the apartment that created them, so it is only ever
+# created and used on the single COM thread below.
+_volume_interface = None
+
+# One long-lived, COM-initialized worker that runs every Do Not Disturb action
+_com_executor: Optional[ThreadPoolExecutor] = None
+_com_executor_lock = threading.Lock()
+
+
+def _com_thread_init():
+    """Initialize COM once for the lifetime of the COM worker thread."""
+    try:
+        import comtypes
+    except ImportError:
+        return
+    comtypes.CoInitialize()
+
+
+def _get_com_executor() -> ThreadPoolExecutor:
+    """Return the single-threaded executor that owns the COM apartment."""
+    global _com_executor
+    with _com_executor_lock:
+        if _com_executor is None:
+            _com_executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix='DailyFlowCOM',
+                initializer=_com_thread_init,
+            )
+        return _com_executor
+
+
+def _get_volume_interface(refresh: bool = False):
+    """Return the speakers' IAudioEndpointVolume, activating it only once."""
+    global _volume_interface
+    if _volume_interface is None or refresh:
+        # Imported lazily so routines without Do Not Disturb never load COM
+        from comtypes import CLSCTX_ALL
+        from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+        
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        _volume_interface = interface.QueryInterface(IAudioEndpointVolume)
+    return _volume_interface
+
+
+def _normalize_url(url: str) -> str:
+    """Ensure a URL has a protocol."""
+    if url and not url.startswith(('http://', 'https://')):
+        return 'https://' + url
+    return url
+
+
+# Popen keyword arguments for fire-and-forget launches. On Windows, skip
+# handle-closing bookkeeping and detach the child from our console.
+if sys.platform == 'win32':
+    _LAUNCH_POPEN_KW = dict(
+        close_fds=False,
+        creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+else:
+    _LAUNCH_POPEN_KW = dict(
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+# Lightweight launcher for resolved executables, bypassing Popen's pipe and
+# file descriptor bookkeeping which a fire-and-forget launch never needs
+if sys.platform == 'win32':
+    import _winapi
+    
+    def _spawn_detached(path: str):
+        """Start an executable detached from this process."""
+        startup_info = subprocess.STARTUPINFO()
+        handles = _winapi.CreateProcess(
+            None, subprocess.list2cmdline([path]), None, None, False,
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+            None, None, startup_info
+        )
+        _winapi.CloseHandle(handles[0])
+        _winapi.CloseHandle(handles[1])
+elif hasattr(os, 'posix_spawn'):
+    def _spawn_detached(path: str):
+        """Start an executable detached from this process."""
+        file_actions = [(os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_RDWR, 0) for fd in (0, 1, 2)]
+        os.posix_spawn(path, [path], os.environ, file_actions=file_actions, setsid=True)
+else:
+    def _spawn_detached(path: str):
+        """Start an executable detached from this process."""
+        subprocess.Popen([path], **_LAUNCH_POPEN_KW)
+
+# Characters that mean a command needs a real shell to interpret it
+_SHELL_METACHARS = frozenset('|&<>^%$`;*?()')
+
+
+def _split_command(command: str) -> Optional[List[str]]:
+    """Split a command line into argv, or None if it needs a shell."""
+    if not command or _SHELL_METACHARS.intersection(command):
+        return None
+    try:
+        tokens = shlex.split(command, posix=(os.name != 'nt'))
+    except ValueError:
+        return None
+    # Non-POSIX mode keeps the quotes around quoted tokens
+    return [t[1:-1] if len(t) > 1 and t[0] == t[-1] == '"' else t for t in tokens] or None
+
+
+@lru_cache(maxsize=None)
+def _resolve_app_path(app_path: str) -> Optional[str]:
+    """Return the path to launch directly, or None to open it via its association."""
+    resolved = shutil.which(app_path)
+    if resolved:
+        return resolved
+    return app_path if os.path.exists(app_path) else None
+
+
+@lru_cache(maxsize=None)
+def _find_associated_executable(path: str) -> Optional[str]:
+    """Return the program Windows associates with a document, or None.
+    
+    Looking this up once lets the document be opened with a plain process
+    launch instead of a Shell association lookup on every run.
+    """
+    if sys.platform != 'win32':
+        return None
+    
+    extension = os.path.splitext(path)[1].upper()
+    if extension in os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD').upper().split(';'):
+        return None  # Already a program
+    
+    import ctypes
+    from ctypes import wintypes
+    
+    find_executable = ctypes.windll.shell32.FindExecutableW
+    find_executable.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.LPWSTR]
+    find_executable.restype = wintypes.HINSTANCE
+    
+    buffer = ctypes.create_unicode_buffer(wintypes.MAX_PATH)
+    result = find_executable(path, None, buffer) or 0
+    # Values of 32 or below are error codes
+    if result <= 32 or not buffer.value:
+        return None
+    return buffer.value
+
+
+@lru_cache(maxsize=1)
+def _default_browser_command() -> Optional[Tuple[str, ...]]:
+    """Resolve the default browser's executable, or None if it can't be found.
+    
+    The result is used to open several URLs as tabs with a single process.
+    """
+    if sys.platform == 'win32':
+        import winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER,
+                                "Software\\Microsoft\\Windows\\Shell\\Associations"
+                                "\\UrlAssociations\\https\\UserChoice") as key:
+                prog_id = winreg.QueryValueEx(key, "ProgId")[0]
+            with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT,
+                                f"{prog_id}\\shell\\open\\command") as key:
+                command = winreg.QueryValueEx(key, "")[0]
+            executable = shlex.split(command, posix=False)[0].strip('"')
+        except (OSError, IndexError, ValueError):
+            return None
+        return (executable,) if os.path.isfile(executable) else None
+    
+    # Only browsers known to accept several URLs on one command line
+    try:
+        browser = webbrowser.get()
+    except webbrowser.Error:
+        return None
+    if not isinstance(browser, (webbrowser.Mozilla, webbrowser.Chrome)):
+        return None
+    executable = shutil.which(browser.name)
+    return (executable,) if executable else None
+
+
+# Human-readable description builders, keyed by action type
+_DESC_BUILDERS: Dict[ActionType, Callable[[Dict[str, Any]], str]] = {
+    ActionType.OPEN_APP: lambda p: f"Opening {os.path.basename(p.get('app_path', ''))}",
+    ActionType.OPEN_WEBSITE: lambda p: f"Opening {p.get('url', '')}",
+    ActionType.SHOW_MESSAGE: lambda p: "Showing message",
+    ActionType.PLAY_MUSIC: lambda p: "Playing music",
+    ActionType.DELAY: lambda p: f"Waiting {p.get('seconds', 0)} seconds",
+    ActionType.DO_NOT_DISTURB: lambda p: "Enabling Do Not Disturb",
+}
+
+
+class PreparedAction(NamedTuple):
+    """An enabled action with its description and handler resolved up front."""
+    action_type: ActionType
+    description: str
+    handler: Callable[['ActionExecutor', Dict[str, Any]], bool]
+    parameters: Dict[str, Any]
+    index: int = 0
+
+
+class RoutineRunnable(QRunnable):
+    """Runs an executor's prepared routine on a QThreadPool worker."""
     
-    action_started = Signal(str)
-    action_completed = Signal(str)
+    def __init__(self, executor: 'ActionExecutor'):
+        super().__init__()
+        self.executor = executor
+    
+    def run(self):
+        self.executor.run()
+
+
+class ActionExecutor(QObject):
+    """Executes actions on a pool thread to avoid blocking the UI."""
+    
+    # (index, total, description, state) where state is "started" or "completed"
+    progress = Signal(int, int, str, str)
+    # List of progress tuples, used instead of progress for long routines
+    progress_batch = Signal(list)
     action_failed = Signal(str, str)
     routine_completed = Signal()
     
-    def __init__(self):
+    def __init__(self, cli_mode: bool = False):
         super().__init__()
+        # In CLI mode messages are printed instead of shown in a dialog
+        self.cli_mode = cli_mode
         self.actions = []
+        self._groups = []
+        self._total = 0
+        self._pending_progress = []
+        self._batch_timer = None
         self.should_stop = False
+        self._stop_event = threading.Event()
+        # Loop and event used to wake an in-progress DELAY when stopping
+        self._loop = None
+        self._stop_async = None
+        self._running = threading.Event()
+        self._shell = None
+        self._shell_lock = threading.Lock()
+    
+    def __del__(self):
+        if getattr(self, '_shell', None) is not None:
+            self.close_shell()
         
     def set_actions(self, actions):
         """Set the actions to execute."""
         self.actions = actions
         self.should_stop = False
+        self._stop_event.clear()
+        prepared = self._prepare_actions(actions)
+        self._total = len(prepared)
+        self._groups = self._build_groups(prepared)
+    
+    def _prepare_actions(self, actions: List[Action]) -> List[PreparedAction]:
+        """Prepare every enabled action so running them only launches."""
+        enabled = [action for action in actions if action.enabled]
+        return [self._prepare(action, index) for index, action in enumerate(enabled)]
+    
+    def _prepare(self, action: Action, index: int = 0) -> PreparedAction:
+        """Resolve the description and handler for an action once."""
+        params = action.parameters
+        # Prepared values go into a copy so they never leak into the saved routine
+        if action.action_type == ActionType.OPEN_WEBSITE:
+            params = dict(params, url=_normalize_url(params.get('url', '')))
+        elif action.action_type == ActionType.PLAY_MUSIC and params.get('command'):
+            params = dict(params, _argv=_split_command(params['command']))
+        elif action.action_type == ActionType.OPEN_APP and params.get('app_path'):
+            resolved = _resolve_app_path(params['app_path'])
+            associated = _find_associated_executable(resolved) if resolved else None
+            params = dict(params, _resolved=resolved, _resolved_exe=associated,
+                          _use_startfile=resolved is None)
+        
+        return PreparedAction(
+            action.action_type,
+            self._get_action_description(action),
+            _EXEC_DISPATCH.get(action.action_type, _unknown_action),
+            params,
+            index
+        )
+    
+    def start(self) -> bool:
+        """Run the prepared actions on the global thread pool.
+        
+        Like QThread.start, this does nothing while a run is in progress.
+        """
+        if self._running.is_set():
+            return False
+        self._running.set()
+        QThreadPool.globalInstance().start(RoutineRunnable(self))
+        return True
+    
+    def isRunning(self) -> bool:
+        """Check whether a routine is currently executing."""
+        return self._running.is_set()
     
     def stop_execution(self):
         """Stop the current execution."""
         self.should_stop = True
+        self._stop_event.set()
+        # The worker clears both when its loop ends, so read each only once
+        loop = self._loop
+        stop_async = self._stop_async
+        if loop is not None and stop_async is not None:
+            try:
+                loop.call_soon_threadsafe(stop_async.set)
+            except RuntimeError:
+                # The loop has already finished
+                pass
+        self.close_shell()
     
-    def run(self):
-        """Execute all actions in sequence."""
-        for i, action in enumerate(self.actions):
-            if self.should_stop:
-                break
-                
-            if not action.enabled:
-                continue
-                
+    def close_shell(self):
+        """Shut down the persistent launch shell, if one is running."""
+        with self._shell_lock:
+            shell, self._shell = self._shell, None
+        if shell is None or shell.poll() is not None:
+            return
+        try:
+            shell.stdin.write(b'exit\r\n')
+            shell.stdin.close()
+        except OSError:
+            pass
+    
+    def _shell_start(self, command_line: str) -> bool:
+        """Run a shell command line through the persistent cmd.exe channel.
+        
+        Starting one shell and piping commands into it avoids paying for a
+        new cmd.exe per shell command. Only pass commands that are meant to
+        be interpreted by cmd.exe (PLAY_MUSIC commands), never bare paths.
+        Returns False when the channel is unavailable so callers can fall
+        back to launching the process directly.
+        """
+        if sys.platform != 'win32':
+            return False
+        
+        # A line break would run the rest as a separate command in the
+        # shared shell, so such commands get a shell of their own instead
+        if '\r' in command_line or '\n' in command_line:
+            return False
+        
+        try:
+            data = f'{command_line}\r\n'.encode('oem')
+        except UnicodeEncodeError:
+            return False
+        
+        with self._shell_lock:
             try:
-                action_desc = self._get_action_description(action)
-                self.action_started.emit(action_desc)
-                
-                success = self._execute_single_action(action)
-                
-                if success:
-                    self.action_completed.emit(action_desc)
-                else:
-                    self.action_failed.emit(action_desc, "Execution failed")
-                    
-            except Exception as e:
-                action_desc = self._get_action_description(action)
-                self.action_failed.emit(action_desc, str(e))
+                if self._shell is None or self._shell.poll() is not None:
+                    self._shell = subprocess.Popen(
+                        ['cmd.exe', '/Q', '/K', '@echo off'],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        creationflags=subprocess.CREATE_NO_WINDOW
+                    )
+                self._shell.stdin.write(data)
+                self._shell.stdin.flush()
+                return True
+            except OSError as e:
+                logger.warning("Launch shell unavailable: %s", e)
+                self._shell = None
+                return False
+    
+    def run(self):
+        """Execute all actions, launching independent ones concurrently."""
+        self._pending_progress = []
+        self._batch_timer = None
+        if self._total > PROGRESS_BATCH_THRESHOLD:
+            self._batch_timer = QElapsedTimer()
+            self._batch_timer.start()
+        
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._run_async())
+        finally:
+            loop.close()
+            self._flush_progress()
+            # Cleared before completion is reported so the UI can restart at once
+            self._running.clear()
         
         if not self.should_stop:
             self.routine_completed.emit()
     
-    def _get_action_description(self, action: Action) -> str:
-        """Get a human-readable description of the action."""
-        if action.action_type == ActionType.OPEN_APP:
-            app_path = action.parameters.get('app_path', '')
-            return f"Opening {os.path.basename(app_path)}"
-        elif action.action_type == ActionType.OPEN_WEBSITE:
-            url = action.parameters.get('url', '')
-            return f"Opening {url}"
-        elif action.action_type == ActionType.SHOW_MESSAGE:
-            return "Showing message"
-        elif action.action_type == ActionType.PLAY_MUSIC:
-            return "Playing music"
-        elif action.action_type == ActionType.DELAY:
-            seconds = action.parameters.get('seconds', 0)
-            return f"Waiting {seconds} seconds"
-        elif action.action_type == ActionType.DO_NOT_DISTURB:
-            return "Enabling Do Not Disturb"
-        return "Unknown action"
-    
-    def _execute_single_action(self, action: Action) -> bool:
-        """Execute a single action."""
+    async def _run_async(self):
+        """Drive the action groups on this thread's event loop.
+        
+        Blocking launches run on a small thread pool so the loop itself
+        never blocks; delays are awaited on the loop and end early on stop.
+        """
+        self._stop_async = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if self.should_stop:
+            self._stop_async.set()
         try:
-            if action.action_type == ActionType.OPEN_APP:
-                return self._open_app(action.parameters)
-            elif action.action_type == ActionType.OPEN_WEBSITE:
-                return self._open_website(action.parameters)
-            elif action.action_type == ActionType.SHOW_MESSAGE:
-                return self._show_message(action.parameters)
-            elif action.action_type == ActionType.PLAY_MUSIC:
-                return self._play_music(action.parameters)
-            elif action.action_type == ActionType.DELAY:
-                return self._delay(action.parameters)
-            elif action.action_type == ActionType.DO_NOT_DISTURB:
-                return self._do_not_disturb(action.parameters)
-            return False
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_ACTIONS) as pool:
+                for group in self._groups:
+                    if self.should_stop:
+                        break
+                    await self._run_group(group, pool)
+        finally:
+            self._loop = None
+            self._stop_async = None
+    
+    def _build_groups(self, prepared: List[PreparedAction]) -> List[List[PreparedAction]]:
+        """Split prepared actions into groups separated by barrier actions.
+        
+        Each DELAY or SHOW_MESSAGE action forms a group of its own so that
+        ordering around it is preserved; everything in between can be
+        launched at the same time.
+        """
+        groups = []
+        current = []
+        for entry in prepared:
+            if entry.action_type in BARRIER_ACTION_TYPES:
+                if current:
+                    groups.append(current)
+                    current = []
+                groups.append([entry])
+            else:
+                current.append(entry)
+        if current:
+            groups.append(current)
+        return groups
+    
+    async def _run_group(self, group: List[PreparedAction], pool: ThreadPoolExecutor):
+        """Execute a group of actions and report results in order."""
+        loop = asyncio.get_running_loop()
+        for entry in group:
+            self._report(entry, "started")
+        # Deliver the starts before waiting on the group
+        self._flush_progress()
+        
+        # Websites in the same group are opened as tabs by one browser launch
+        urls = [entry.parameters.get('url', '') for entry in group
+                if entry.action_type == ActionType.OPEN_WEBSITE]
+        website_batch = None
+        if len(urls) > 1:
+            website_batch = loop.run_in_executor(pool, self._open_websites_batch, urls)
+        
+        async def execute(entry):
+            if website_batch is not None and entry.action_type == ActionType.OPEN_WEBSITE:
+                return (await website_batch), "Execution failed"
+            if entry.action_type == ActionType.DELAY:
+                return await self._delay_async(entry.parameters)
+            return await loop.run_in_executor(pool, self._execute_prepared, entry)
+        
+        outcomes = await asyncio.gather(*(execute(entry) for entry in group),
+                                        return_exceptions=True)
+        
+        for entry, outcome in zip(group, outcomes):
+            if outcome is None:
+                # Cut short by the user; neither completed nor failed
+                continue
+            if isinstance(outcome, BaseException):
+                success, error = False, str(outcome)
+            else:
+                success, error = outcome
+            if success:
+                self._report(entry, "completed")
+                continue
+            # Keep the log in order by delivering queued progress first
+            self._flush_progress()
+            self.action_failed.emit(entry.description, error)
+    
+    def _report(self, entry: PreparedAction, state: str):
+        """Report an action's progress, batching it for long routines."""
+        update = (entry.index, self._total, entry.description, state)
+        if self._batch_timer is None:
+            self.progress.emit(*update)
+            return
+        
+        self._pending_progress.append(update)
+        if self._batch_timer.hasExpired(PROGRESS_BATCH_INTERVAL_MS):
+            self._flush_progress()
+    
+    def _flush_progress(self):
+        """Emit any batched progress updates."""
+        if not self._pending_progress:
+            return
+        batch, self._pending_progress = self._pending_progress, []
+        self.progress_batch.emit(batch)
+        self._batch_timer.restart()
+    
+    def _execute_prepared(self, entry: PreparedAction) -> Tuple[bool, Optional[str]]:
+        """Run a prepared action's handler, on the COM thread when needed."""
+        if entry.action_type != ActionType.DO_NOT_DISTURB:
+            return self._call_handler(entry.handler, entry.parameters)
+        
+        # The cached audio interface must stay in the apartment it was made in
+        future = _get_com_executor().submit(self._call_handler, entry.handler, entry.parameters)
+        return future.result()
+    
+    def _call_handler(self, handler, params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Invoke an action handler and return (success, error message).
+        
+        This is the single place where handler exceptions are caught.
+        """
+        try:
+            if handler(self, params):
+                return True, None
+            return False, "Execution failed"
         except Exception as e:
-            print(f"Error executing action: {e}")
-            return False
+            logger.error("Error executing action: %s", e)
+            return False, str(e)
+    
+    def _get_action_description(self, action: Action) -> str:
+        """Get a human-readable description of the action."""
+        builder = _DESC_BUILDERS.get(action.action_type)
+        return builder(action.parameters) if builder else "Unknown action"
+    
+    def _execute_single_action(self, action: Action) -> Tuple[bool, Optional[str]]:
+        """Execute a single action, returning (success, error message)."""
+        return self._execute_prepared(self._prepare(action))
     
     def _open_app(self, params: Dict[str, Any]) -> bool:
         """Open a desktop application."""
@@ -110,20 +551,22 @@ class ActionExecutor(QThread):
         if not app_path:
             return False
         
-        try:
-            # Handle different ways to specify applications
-            if app_path.endswith('.exe') and not os.path.exists(app_path):
-                # Try to find the app in PATH
-                subprocess.Popen([app_path])
-            elif os.path.exists(app_path):
-                subprocess.Popen([app_path])
-            else:
-                # Try as a system command
-                os.startfile(app_path)
+        associated = params.get('_resolved_exe')
+        if associated:
+            # A document whose handler was looked up when preparing
+            subprocess.Popen([associated, params['_resolved']], **_LAUNCH_POPEN_KW)
             return True
-        except Exception as e:
-            print(f"Failed to open app {app_path}: {e}")
-            return False
+        
+        if not params.get('_use_startfile', True):
+            try:
+                _spawn_detached(params['_resolved'])
+                return True
+            except OSError:
+                pass  # Not a program, e.g. a document; let the shell open it
+        
+        # Opened by its association; raises if the target does not exist
+        os.startfile(app_path)
+        return True
     
     def _open_website(self, params: Dict[str, Any]) -> bool:
         """Open a website in the default browser."""
@@ -131,30 +574,44 @@ class ActionExecutor(QThread):
         if not url:
             return False
         
-        try:
-            # Ensure URL has protocol
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-            
-            webbrowser.open(url)
-            return True
-        except Exception as e:
-            print(f"Failed to open website {url}: {e}")
-            return False
+        # The protocol was already added when the action was prepared
+        webbrowser.open(url)
+        return True
+    
+    def _open_websites_batch(self, urls: List[str]) -> bool:
+        """Open several websites with a single browser process."""
+        if all(urls):
+            browser = _default_browser_command()
+            if browser:
+                try:
+                    subprocess.Popen([*browser, *urls], **_LAUNCH_POPEN_KW)
+                    return True
+                except OSError as e:
+                    logger.warning("Failed to launch browser %s: %s", browser[0], e)
+        
+        # Fall back to opening each URL individually
+        success = True
+        for url in urls:
+            try:
+                success = self._open_website({'url': url}) and success
+            except Exception as e:
+                logger.error("Failed to open website %s: %s", url, e)
+                success = False
+        return success
     
     def _show_message(self, params: Dict[str, Any]) -> bool:
         """Show a message dialog."""
         message = params.get('message', '')
         title = params.get('title', 'DailyFlow')
         
-        try:
-            # We'll emit a signal to show the message in the main thread
-            # since QMessageBox needs to be created in the main thread
-            self.show_message_signal.emit(title, message)
+        if self.cli_mode:
+            print(f"[MSG] {title}: {message}")
             return True
-        except Exception as e:
-            print(f"Failed to show message: {e}")
-            return False
+        
+        # We'll emit a signal to show the message in the main thread
+        # since QMessageBox needs to be created in the main thread
+        self.show_message_signal.emit(title, message)
+        return True
     
     # Add signal for showing messages
     show_message_signal = Signal(str, str)
@@ -164,43 +621,62 @@ class ActionExecutor(QThread):
         music_url = params.get('url', '')
         command = params.get('command', '')
         
-        try:
-            if music_url:
-                # Try to open music URL in default media player
-                webbrowser.open(music_url)
-                return True
-            elif command:
-                # Execute system command
-                subprocess.Popen(command, shell=True)
-                return True
-            return False
-        except Exception as e:
-            print(f"Failed to play music: {e}")
-            return False
+        if music_url:
+            # Try to open music URL in default media player
+            webbrowser.open(music_url)
+            return True
+        elif command:
+            # Launch the program directly when no shell syntax is involved
+            argv = params.get('_argv')
+            if argv:
+                try:
+                    subprocess.Popen(argv, **_LAUNCH_POPEN_KW)
+                    return True
+                except OSError:
+                    pass  # Not an executable, e.g. a shell builtin like "start"
+            
+            # Execute system command
+            if not self._shell_start(command):
+                subprocess.Popen(command, shell=True, **_LAUNCH_POPEN_KW)
+            return True
+        return False
     
     def _delay(self, params: Dict[str, Any]) -> bool:
-        """Wait for specified number of seconds."""
+        """Wait for specified number of seconds, or until execution is stopped.
+        
+        Used for single actions run outside the event loop (CLI mode).
+        """
+        seconds = params.get('seconds', 1)
+        interrupted = self._stop_event.wait(float(seconds))
+        return not interrupted
+    
+    async def _delay_async(self, params: Dict[str, Any]) -> Optional[Tuple[bool, Optional[str]]]:
+        """Wait on the event loop for a DELAY, or until execution is stopped.
+        
+        Returns None when the delay was cut short by stop_execution.
+        """
         seconds = params.get('seconds', 1)
         try:
-            time.sleep(float(seconds))
-            return True
+            await asyncio.wait_for(self._stop_async.wait(), float(seconds))
+        except asyncio.TimeoutError:
+            return True, None
         except Exception as e:
-            print(f"Failed to delay: {e}")
-            return False
+            logger.error("Error executing action: %s", e)
+            return False, str(e)
+        return None
     
     def _do_not_disturb(self, params: Dict[str, Any]) -> bool:
         """Enable Do Not Disturb mode (mute system volume)."""
         try:
-            # Get the default audio device
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            volume = interface.QueryInterface(IAudioEndpointVolume)
-            
-            # Mute the system
-            volume.SetMute(1, None)
+            # Mute the system, re-activating the device if the cached
+            # interface has gone stale (e.g. default device changed)
+            try:
+                _get_volume_interface().SetMute(1, None)
+            except Exception:
+                _get_volume_interface(refresh=True).SetMute(1, None)
             return True
         except Exception as e:
-            print(f"Failed to enable Do Not Disturb: {e}")
+            logger.warning("Failed to enable Do Not Disturb: %s", e)
             # Fallback: try to mute using nircmd if available
             try:
                 subprocess.run(['nircmd.exe', 'mutesysvolume', '1'], check=True)
@@ -209,12 +685,30 @@ class ActionExecutor(QThread):
                 return False
 
 
+def _unknown_action(executor: ActionExecutor, params: Dict[str, Any]) -> bool:
+    """Handler for action types the executor does not know about."""
+    return False
+
+
+# Action handlers, keyed by action type
+_EXEC_DISPATCH: Dict[ActionType, Callable[[ActionExecutor, Dict[str, Any]], bool]] = {
+    ActionType.OPEN_APP: ActionExecutor._open_app,
+    ActionType.OPEN_WEBSITE: ActionExecutor._open_website,
+    ActionType.SHOW_MESSAGE: ActionExecutor._show_message,
+    ActionType.PLAY_MUSIC: ActionExecutor._play_music,
+    ActionType.DELAY: ActionExecutor._delay,
+    ActionType.DO_NOT_DISTURB: ActionExecutor._do_not_disturb,
+}
+
+
 class StaticActionExecutor:
     """Static methods for executing actions without threading (for testing)."""
     
     @staticmethod
     def show_message_dialog(title: str, message: str, parent=None):
         """Show a message dialog in the main thread."""
+        from PySide6.QtWidgets import QMessageBox
+        
         msg = QMessageBox(parent)
         msg.setWindowTitle(title)
         msg.setText(message)
@@ -3,18 +3,15 @@ Main entry point for DailyFlow application.
 """
 import sys
 import argparse
-from main_window import main as gui_main
-from models import RoutineManager
-from action_executor import ActionExecutor
+from models import RoutineManager, load_routine
 
 
 def run_routine_cli(routine_name: str):
     """Run a routine from command line (for scheduled execution)."""
     print(f"DailyFlow: Starting routine '{routine_name}'")
     
-    # Load routine manager
-    routine_manager = RoutineManager()
-    routine = routine_manager.get_routine(routine_name)
+    # Only the routine being run is built from the config file
+    routine = load_routine(routine_name)
     
     if not routine:
         print(f"Error: Routine '{routine_name}' not found.")
@@ -31,10 +28,15 @@ def run_routine_cli(routine_name: str):
     # Execute routine actions
     print(f"Executing {len(routine.actions)} actions...")
     
-    # Create a simple synchronous executor for CLI
+    # Create a simple synchronous executor for CLI. Imported here so that
+    # listing routines never loads Qt.
     from action_executor import ActionExecutor
     
     class CLIExecutor:
+        def __init__(self):
+            # One executor serves every action in the routine
+            self.executor = ActionExecutor(cli_mode=True)
+        
         def execute_routine(self, actions):
             for i, action in enumerate(actions, 1):
                 if not action.enabled:
@@ -43,22 +45,15 @@ def run_routine_cli(routine_name: str):
                     
                 print(f"  [{i}] {self._get_action_description(action)}")
                 
-                # Create a temporary GUI app context for actions that need it
-                from PySide6.QtWidgets import QApplication
-                if not QApplication.instance():
-                    app = QApplication([])
-                
-                executor = ActionExecutor()
-                success = executor._execute_single_action(action)
+                success, error = self.executor._execute_single_action(action)
                 
                 if success:
                     print(f"      [OK] Completed")
                 else:
-                    print(f"      [FAIL] Failed")
+                    print(f"      [FAIL] Failed: {error}")
         
         def _get_action_description(self, action):
-            executor = ActionExecutor()
-            return executor._get_action_description(action)
+            return self.executor._get_action_description(action)
     
     cli_executor = CLIExecutor()
     cli_executor.execute_routine(routine.actions)
@@ -85,14 +80,12 @@ def main():
     if args.list_routines:
         # List available routines
         routine_manager = RoutineManager()
-        routines = routine_manager.get_all_routines()
-        
-        if not routines:
+        if routine_manager.is_empty():
             print("No routines found.")
             return 0
         
         print("Available routines:")
-        for routine in routines:
+        for routine in routine_manager.iter_routines():
             status = "enabled" if routine.enabled else "disabled"
             scheduled = f" (scheduled at {routine.scheduled_time})" if routine.scheduled_time else ""
             print(f"  - {routine.name} [{status}]{scheduled}")
@@ -105,6 +98,7 @@ def main():
         return run_routine_cli(args.routine)
     
     # No arguments provided, start GUI
+    from main_window import main as gui_main
     gui_main()
 
 
@@ -2,12 +2,14 @@
 Main window for DailyFlow application.
 """
 import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QListWidget, QListWidgetItem, QPushButton,
                              QLabel, QSplitter, QMessageBox, QProgressBar, QTextEdit,
-                             QScrollArea, QFrame, QMenuBar)
+                             QScrollArea, QFrame, QMenuBar, QStackedWidget)
 from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFont, QIcon, QAction
+from PySide6.QtGui import QFont, QIcon, QAction, QTextCursor
 from models import RoutineManager, Routine, create_sample_routine
 from routine_editor import RoutineEditor
 from action_executor import ActionExecutor, StaticActionExecutor
@@ -16,27 +18,139 @@ from settings import SettingsManager, Theme, get_theme_styles
 from settings_dialog import SettingsDialog
 
 
+# Shared fonts are created lazily because QFont needs a QApplication
+@lru_cache(maxsize=None)
+def _title_font() -> QFont:
+    """Get the font used for panel titles."""
+    font = QFont()
+    font.setPointSize(14)
+    font.setBold(True)
+    return font
+
+
+@lru_cache(maxsize=None)
+def _log_label_font() -> QFont:
+    """Get the font used for the execution log label."""
+    return QFont("", 10, QFont.Weight.Bold)
+
+
+# Combined window stylesheet per theme, built on first use
+_THEME_CACHE: Dict[Theme, str] = {}
+
+
+def _build_theme_stylesheet(theme: Theme) -> str:
+    """Build the main window stylesheet for a theme.
+    
+    Buttons and the log are targeted by object name so the whole window
+    is styled from one sheet instead of one per widget.
+    """
+    styles = get_theme_styles(theme)
+    
+    return f"""
+        QMainWindow {{
+            background-color: {styles['main_bg']};
+            color: {styles['text_color']};
+        }}
+        QWidget {{
+            background-color: {styles['panel_bg']};
+            color: {styles['text_color']};
+        }}
+        QLabel {{
+            color: {styles['text_color']};
+        }}
+        QPushButton#newRoutineButton, QPushButton#stopButton {{
+            background-color: {styles['button_secondary']};
+            color: white;
+            border: none;
+            padding: 8px;
+            border-radius: 5px;
+            font-size: 12px;
+        }}
+        QPushButton#newRoutineButton:hover, QPushButton#stopButton:hover {{
+            background-color: {styles['button_secondary_hover']};
+        }}
+        QPushButton#startButton {{
+            background-color: {styles['button_primary']};
+            color: white;
+            border: none;
+            padding: 10px;
+            font-size: 14px;
+            font-weight: bold;
+            border-radius: 5px;
+        }}
+        QPushButton#startButton:hover {{
+            background-color: {styles['button_primary_hover']};
+        }}
+        QPushButton#startButton:disabled {{
+            background-color: #cccccc;
+        }}
+        QPushButton#deleteRoutineButton {{
+            background-color: {styles['button_danger']};
+            color: white;
+            border: none;
+            padding: 8px;
+            font-size: 12px;
+            border-radius: 5px;
+        }}
+        QPushButton#deleteRoutineButton:hover {{
+            background-color: {styles['button_danger_hover']};
+        }}
+        QTextEdit#executionLog {{
+            background-color: {styles['log_bg']};
+            color: {styles['log_text']};
+            border: 2px solid {styles['button_primary']};
+            border-radius: 5px;
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 11px;
+            padding: 8px;
+        }}
+    """
+
+
 class MainWindow(QMainWindow):
     """Main application window with routine list and editor."""
     
     def __init__(self):
         super().__init__()
         self.routine_manager = RoutineManager()
+        # Coalesce bursts of routine edits into a single write to disk
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(500)
+        self._persist_timer.timeout.connect(self.routine_manager.save_routines)
+        self.routine_manager.set_save_scheduler(self._persist_timer.start)
         self.scheduler_manager = SchedulerManager()
         self.action_executor = ActionExecutor()
         self.settings_manager = SettingsManager()
         self.current_routine = None
+        # Name the edited routine is stored under; the editor renames in place
+        self._editing_name: Optional[str] = None
+        # List items by routine name, so reloads only touch rows that changed
+        self._item_by_name: Dict[str, QListWidgetItem] = {}
+        # Last (text, tooltip) written to each item, to skip no-op updates
+        self._item_state: Dict[str, Tuple[str, str]] = {}
+        # Log lines are buffered and written to the execution log in batches
+        self._log_buffer: List[str] = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(16)
+        self._log_timer.timeout.connect(self._flush_log)
+        # Editor changes are applied after a short pause, not once per signal
+        self._pending_change = None
+        self._routine_change_timer = QTimer(self)
+        self._routine_change_timer.setSingleShot(True)
+        self._routine_change_timer.setInterval(150)
+        self._routine_change_timer.timeout.connect(self.flush_routine_change)
         
         self.init_ui()
         self.setup_connections()
         self.apply_theme(self.settings_manager.get_theme())
-        self.load_routines()
         
         # Create sample routine if no routines exist
-        if not self.routine_manager.get_all_routines():
+        if self.routine_manager.is_empty():
             sample = create_sample_routine()
             self.routine_manager.add_routine(sample)
-            self.load_routines()
+        self.load_routines()
         
         # Auto-run daily routine if enabled
         if self.settings_manager.get('auto_run_daily_routine', False):
@@ -88,10 +202,7 @@ class MainWindow(QMainWindow):
         
         # Title
         title = QLabel("My Routines")
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # Routine list
@@ -103,71 +214,19 @@ class MainWindow(QMainWindow):
         button_layout = QVBoxLayout()
         
         self.start_button = QPushButton("🚀 Start My Day")
-        self.start_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 10px;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-        """)
+        self.start_button.setObjectName("startButton")
         button_layout.addWidget(self.start_button)
         
         self.new_routine_button = QPushButton("➕ New Routine")
-        self.new_routine_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 8px;
-                font-size: 12px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-        """)
+        self.new_routine_button.setObjectName("newRoutineButton")
         button_layout.addWidget(self.new_routine_button)
         
         self.delete_routine_button = QPushButton("🗑️ Delete Routine")
-        self.delete_routine_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 8px;
-                font-size: 12px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-        """)
+        self.delete_routine_button.setObjectName("deleteRoutineButton")
         button_layout.addWidget(self.delete_routine_button)
         
         self.stop_button = QPushButton("⏹️ Stop Routine")
-        self.stop_button.setStyleSheet("""
-            QPushButton {
-                background-color: #FF9800;
-                color: white;
-                border: none;
-                padding: 8px;
-                font-size: 12px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #F57C00;
-            }
-        """)
+        self.stop_button.setObjectName("stopButton")
         self.stop_button.setEnabled(False)
         button_layout.addWidget(self.stop_button)
         
@@ -175,22 +234,14 @@ class MainWindow(QMainWindow):
         
         # Execution log
         log_label = QLabel("Execution Log:")
-        log_label.setFont(QFont("", 10, QFont.Weight.Bold))
+        log_label.setFont(_log_label_font())
         layout.addWidget(log_label)
         
         self.execution_log = QTextEdit()
         self.execution_log.setMaximumHeight(150)
-        self.execution_log.setStyleSheet("""
-            QTextEdit {
-                background-color: #2b2b2b;
-                color: #ffffff;
-                border: 2px solid #4CAF50;
-                border-radius: 5px;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 11px;
-                padding: 8px;
-            }
-        """)
+        self.execution_log.setObjectName("executionLog")
+        self.execution_log.document().setMaximumBlockCount(
+            self.settings_manager.get('execution_log_lines', 100))
         layout.addWidget(self.execution_log)
         
         return panel
@@ -202,19 +253,27 @@ class MainWindow(QMainWindow):
         
         # Title
         self.editor_title = QLabel("Select a routine to edit")
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        self.editor_title.setFont(title_font)
+        self.editor_title.setFont(_title_font())
         layout.addWidget(self.editor_title)
         
-        # Routine editor
-        self.routine_editor = RoutineEditor()
-        self.routine_editor.setEnabled(False)
-        layout.addWidget(self.routine_editor)
+        # Routine editor, built on first selection; a blank page stands in until then
+        self.routine_editor = None
+        self.editor_stack = QStackedWidget()
+        self.editor_stack.addWidget(QWidget())
+        layout.addWidget(self.editor_stack)
         
         return panel
     
+    def ensure_routine_editor(self) -> RoutineEditor:
+        """Create the routine editor the first time it is needed."""
+        if self.routine_editor is None:
+            self.routine_editor = RoutineEditor()
+            self.routine_editor.routine_changed.connect(self.on_routine_changed)
+            self.routine_editor.routine_saved.connect(self.on_routine_saved)
+            self.editor_stack.addWidget(self.routine_editor)
+            self.editor_stack.setCurrentWidget(self.routine_editor)
+        return self.routine_editor
+    
     def setup_connections(self):
         """Set up signal connections."""
         # Button connections
@@ -226,45 +285,84 @@ class MainWindow(QMainWindow):
         # List selection
         self.routine_list.currentItemChanged.connect(self.on_routine_selected)
         
-        # Editor connections
-        self.routine_editor.routine_changed.connect(self.on_routine_changed)
-        
         # Action executor connections
-        self.action_executor.action_started.connect(self.on_action_started)
-        self.action_executor.action_completed.connect(self.on_action_completed)
+        self.action_executor.progress.connect(self.on_action_progress)
+        self.action_executor.progress_batch.connect(self.on_action_progress_batch)
         self.action_executor.action_failed.connect(self.on_action_failed)
         self.action_executor.routine_completed.connect(self.on_routine_completed)
-        self.action_executor.show_message_signal.connect(StaticActionExecutor.show_message_dialog)
+        # Always queued, so dialogs are built on the GUI thread even though
+        # the signal is emitted from a pool worker
+        self.action_executor.show_message_signal.connect(
+            StaticActionExecutor.show_message_dialog, Qt.ConnectionType.QueuedConnection)
     
     def load_routines(self):
-        """Load routines into the list widget."""
-        self.routine_list.clear()
-        routines = self.routine_manager.get_all_routines()
-        
-        for routine in routines:
-            item = QListWidgetItem(routine.name)
-            item.setData(Qt.ItemDataRole.UserRole, routine.name)
+        """Sync the list widget with the routine manager, updating changed rows only."""
+        desired = {routine.name for routine in self.routine_manager.iter_routines()}
+        
+        self.routine_list.setUpdatesEnabled(False)
+        self.routine_list.blockSignals(True)
+        try:
+            # Rows for removed routines are reused for new ones where possible
+            spare_items = []
+            for name in set(self._item_by_name) - desired:
+                item = self._item_by_name.pop(name)
+                self._item_state.pop(name, None)
+                spare_items.append(self.routine_list.takeItem(self.routine_list.row(item)))
             
-            # Add description as tooltip
-            if routine.description:
-                item.setToolTip(f"{routine.name}: {routine.description}")
-            
-            # Mark scheduled routines
-            if routine.scheduled_time:
-                item.setText(f"{routine.name} ⏰ {routine.scheduled_time}")
-            
-            self.routine_list.addItem(item)
-        
-        # Select first routine if available
-        if self.routine_list.count() > 0:
+            for row, routine in enumerate(self.routine_manager.iter_routines()):
+                item = self._item_by_name.get(routine.name)
+                if item is None:
+                    item = spare_items.pop() if spare_items else QListWidgetItem()
+                    item.setData(Qt.ItemDataRole.UserRole, routine.name)
+                    self.routine_list.insertItem(row, item)
+                    self._item_by_name[routine.name] = item
+                elif self.routine_list.item(row) is not item:
+                    self.routine_list.takeItem(self.routine_list.row(item))
+                    self.routine_list.insertItem(row, item)
+                
+                # Mark scheduled routines
+                text = routine.name
+                if routine.scheduled_time:
+                    text = f"{routine.name} ⏰ {routine.scheduled_time}"
+                
+                # Add description as tooltip
+                tooltip = f"{routine.name}: {routine.description}" if routine.description else ""
+                
+                state = (text, tooltip)
+                old_state = self._item_state.get(routine.name)
+                if old_state != state:
+                    if old_state is None or old_state[0] != text:
+                        item.setText(text)
+                    if old_state is None or old_state[1] != tooltip:
+                        item.setToolTip(tooltip)
+                    self._item_state[routine.name] = state
+        finally:
+            self.routine_list.blockSignals(False)
+            self.routine_list.setUpdatesEnabled(True)
+        
+        # Select first routine if nothing is selected
+        if self.routine_list.currentItem() is None and self.routine_list.count() > 0:
             self.routine_list.setCurrentRow(0)
     
+    def select_routine(self, name: str):
+        """Select the list row for a routine, if it is listed."""
+        item = self._item_by_name.get(name)
+        if item is not None:
+            self.routine_list.setCurrentItem(item)
+    
     def on_routine_selected(self, current_item, previous_item):
         """Handle routine selection change."""
+        # Save edits to the previous routine before switching away from it
+        if self.routine_editor is not None:
+            self.routine_editor.flush_pending()
+        self.flush_routine_change(reselect=False)
+        
         if current_item is None:
-            self.routine_editor.setEnabled(False)
+            if self.routine_editor is not None:
+                self.routine_editor.setEnabled(False)
             self.editor_title.setText("Select a routine to edit")
             self.current_routine = None
+            self._editing_name = None
             return
         
         routine_name = current_item.data(Qt.ItemDataRole.UserRole)
@@ -272,44 +370,84 @@ class MainWindow(QMainWindow):
         
         if routine:
             self.current_routine = routine
-            self.routine_editor.setEnabled(True)
+            self._editing_name = routine_name
+            editor = self.ensure_routine_editor()
+            editor.setEnabled(True)
             self.editor_title.setText(f"Editing: {routine.name}")
-            self.routine_editor.load_routine(routine)
+            editor.load_routine(routine)
+    
+    def on_routine_changed(self, routine: Routine, name: str):
+        """Handle routine changes from editor, with the name it proposes."""
+        if not self.current_routine:
+            return
+        
+        if self._pending_change is not None and self._pending_change[1] is not routine:
+            self.flush_routine_change()
+        
+        # The editor never renames the routine itself, so routine.name is
+        # still the name it is stored under; the latest proposal wins
+        self._pending_change = (routine.name, routine, name)
+        self._routine_change_timer.start()
+    
+    def on_routine_saved(self, routine: Routine):
+        """Apply an explicitly saved routine now, reporting a rejected name."""
+        self.flush_routine_change(notify=True)
     
-    def on_routine_changed(self, routine: Routine):
-        """Handle routine changes from editor."""
-        if self.current_routine:
-            old_name = self.current_routine.name
-            if self.routine_manager.update_routine(old_name, routine):
+    def flush_routine_change(self, reselect: bool = True, notify: bool = False):
+        """Apply the queued editor change, if any, right away.
+        
+        With notify set, a rejected name is reported to the user and the
+        editor's name field is reset to the stored name.
+        """
+        self._routine_change_timer.stop()
+        if self._pending_change is None:
+            return
+        
+        old_name, routine, new_name = self._pending_change
+        self._pending_change = None
+        rejected_name = None
+        if not new_name or (new_name != old_name
+                            and self.routine_manager.has_routine(new_name)):
+            # Half-typed names may be blank or clash with another routine;
+            # keep the stored name but still save the other fields
+            rejected_name = new_name
+        elif new_name != old_name:
+            routine.name = new_name
+        
+        if rejected_name is not None and notify:
+            if self.routine_editor is not None:
+                self.routine_editor.show_name(old_name)
+            if rejected_name:
+                message = f"A routine named '{rejected_name}' already exists."
+            else:
+                message = "Routine name cannot be empty."
+            QMessageBox.warning(self, "Invalid Name", f"{message} Keeping the name '{old_name}'.")
+        
+        if self.routine_manager.update_routine(old_name, routine):
+            if self._editing_name == old_name:
+                self._editing_name = routine.name
+            # Keep the same row on rename so the selection is not lost
+            item = self._item_by_name.pop(old_name, None)
+            if item is not None:
+                item.setData(Qt.ItemDataRole.UserRole, routine.name)
+                self._item_by_name[routine.name] = item
+                self._item_state[routine.name] = self._item_state.pop(old_name, None)
+            self.load_routines()
+            
+            # Reselect the updated routine
+            if reselect:
                 self.current_routine = routine
-                self.load_routines()
-                
-                # Reselect the updated routine
-                for i in range(self.routine_list.count()):
-                    item = self.routine_list.item(i)
-                    if item.data(Qt.ItemDataRole.UserRole) == routine.name:
-                        self.routine_list.setCurrentRow(i)
-                        break
+                self.select_routine(routine.name)
     
     def new_routine(self):
         """Create a new routine."""
-        routine = Routine(name="New Routine", description="A new routine")
-        
-        # Find unique name
-        counter = 1
-        original_name = routine.name
-        while any(r.name == routine.name for r in self.routine_manager.get_all_routines()):
-            routine.name = f"{original_name} {counter}"
-            counter += 1
+        name = self.routine_manager.unique_name("New Routine")
+        routine = Routine(name=name, description="A new routine")
         
         if self.routine_manager.add_routine(routine):
             self.load_routines()
             # Select the new routine
-            for i in range(self.routine_list.count()):
-                item = self.routine_list.item(i)
-                if item.data(Qt.ItemDataRole.UserRole) == routine.name:
-                    self.routine_list.setCurrentRow(i)
-                    break
+            self.select_routine(routine.name)
     
     def delete_routine(self):
         """Delete the selected routine."""
@@ -331,7 +469,9 @@ class MainWindow(QMainWindow):
             if self.routine_manager.delete_routine(routine_name):
                 self.load_routines()
                 self.current_routine = None
-                self.routine_editor.setEnabled(False)
+                self._editing_name = None
+                if self.routine_editor is not None:
+                    self.routine_editor.setEnabled(False)
                 self.editor_title.setText("Select a routine to edit")
     
     def start_routine(self):
@@ -353,8 +493,8 @@ class MainWindow(QMainWindow):
         self.stop_button.setEnabled(True)
         
         # Clear log and show progress
-        self.execution_log.clear()
-        self.execution_log.append(f"Starting routine: {routine.name}")
+        self.clear_log()
+        self.log(f"Starting routine: {routine.name}")
         
         # Start execution
         self.action_executor.set_actions(routine.actions)
@@ -364,27 +504,68 @@ class MainWindow(QMainWindow):
         """Stop the currently executing routine."""
         self.action_executor.stop_execution()
         self.on_routine_completed()
-        self.execution_log.append("Routine stopped by user.")
+        self.log("Routine stopped by user.")
+    
+    def on_action_progress(self, index: int, total: int, description: str, state: str):
+        """Handle a progress update from the executor."""
+        if state == "started":
+            self.on_action_started(description)
+        else:
+            self.on_action_completed(description)
+    
+    def on_action_progress_batch(self, updates: list):
+        """Handle a batch of progress updates."""
+        for update in updates:
+            self.on_action_progress(*update)
     
     def on_action_started(self, description: str):
         """Handle action started event."""
-        self.execution_log.append(f"▶️ {description}")
+        self.log(f"▶️ {description}")
         self.statusBar().showMessage(f"Executing: {description}")
     
     def on_action_completed(self, description: str):
         """Handle action completed event."""
-        self.execution_log.append(f"✅ {description} - Completed")
+        self.log(f"✅ {description} - Completed")
     
     def on_action_failed(self, description: str, error: str):
         """Handle action failed event."""
-        self.execution_log.append(f"❌ {description} - Failed: {error}")
+        self.log(f"❌ {description} - Failed: {error}")
     
     def on_routine_completed(self):
         """Handle routine completion."""
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.statusBar().showMessage("Routine completed")
-        self.execution_log.append("🎉 Routine completed!")
+        self.log("🎉 Routine completed!")
+    
+    def log(self, line: str):
+        """Queue a line for the execution log."""
+        self._log_buffer.append(line)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+    
+    def clear_log(self):
+        """Clear the execution log, dropping any queued lines."""
+        self._log_timer.stop()
+        self._log_buffer.clear()
+        self.execution_log.clear()
+    
+    def _flush_log(self):
+        """Write queued log lines in one insert and scroll to the end."""
+        if not self._log_buffer:
+            return
+        
+        text = '\n'.join(self._log_buffer)
+        self._log_buffer.clear()
+        if not self.execution_log.document().isEmpty():
+            text = '\n' + text
+        
+        cursor = QTextCursor(self.execution_log.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        
+        scroll_bar = self.execution_log.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
     
     def create_menu_bar(self):
         """Create the menu bar."""
@@ -412,7 +593,7 @@ class MainWindow(QMainWindow):
     
     def open_settings(self):
         """Open the settings dialog."""
-        routine_names = [routine.name for routine in self.routine_manager.get_all_routines()]
+        routine_names = [routine.name for routine in self.routine_manager.iter_routines()]
         dialog = SettingsDialog(self.settings_manager, routine_names, self)
         
         # Connect signals
@@ -423,99 +604,26 @@ class MainWindow(QMainWindow):
     
     def apply_theme(self, theme: Theme):
         """Apply a color theme to the application."""
-        styles = get_theme_styles(theme)
-        
-        # Main window style
-        main_style = f"""
-            QMainWindow {{
-                background-color: {styles['main_bg']};
-                color: {styles['text_color']};
-            }}
-            QWidget {{
-                background-color: {styles['panel_bg']};
-                color: {styles['text_color']};
-            }}
-            QLabel {{
-                color: {styles['text_color']};
-            }}
-        """
-        
-        # Button styles
-        button_style = f"""
-            QPushButton {{
-                background-color: {styles['button_secondary']};
-                color: white;
-                border: none;
-                padding: 8px;
-                border-radius: 5px;
-                font-size: 12px;
-            }}
-            QPushButton:hover {{
-                background-color: {styles['button_secondary_hover']};
-            }}
-        """
-        
-        # Start button special style
-        start_button_style = f"""
-            QPushButton {{
-                background-color: {styles['button_primary']};
-                color: white;
-                border: none;
-                padding: 10px;
-                font-size: 14px;
-                font-weight: bold;
-                border-radius: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: {styles['button_primary_hover']};
-            }}
-            QPushButton:disabled {{
-                background-color: #cccccc;
-            }}
-        """
-        
-        # Delete button style
-        delete_button_style = f"""
-            QPushButton {{
-                background-color: {styles['button_danger']};
-                color: white;
-                border: none;
-                padding: 8px;
-                font-size: 12px;
-                border-radius: 5px;
-            }}
-            QPushButton:hover {{
-                background-color: {styles['button_danger_hover']};
-            }}
-        """
-        
-        # Execution log style
-        log_style = f"""
-            QTextEdit {{
-                background-color: {styles['log_bg']};
-                color: {styles['log_text']};
-                border: 2px solid {styles['button_primary']};
-                border-radius: 5px;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 11px;
-                padding: 8px;
-            }}
-        """
-        
-        # Apply styles
-        self.setStyleSheet(main_style)
-        self.start_button.setStyleSheet(start_button_style)
-        self.delete_routine_button.setStyleSheet(delete_button_style)
-        self.execution_log.setStyleSheet(log_style)
-        
-        # Apply button style to other buttons
-        for button in [self.new_routine_button, self.stop_button]:
-            button.setStyleSheet(button_style)
+        # One stylesheet for the whole window means a single parse and polish
+        stylesheet = _THEME_CACHE.get(theme)
+        if stylesheet is None:
+            stylesheet = _THEME_CACHE[theme] = _build_theme_stylesheet(theme)
+        self.setStyleSheet(stylesheet)
+    
+    def closeEvent(self, event):
+        """Flush any pending routine save before closing."""
+        if self.routine_editor is not None:
+            self.routine_editor.flush_pending()
+        self.flush_routine_change(reselect=False, notify=True)
+        if self._persist_timer.isActive():
+            self._persist_timer.stop()
+            self.routine_manager.save_routines()
+        super().closeEvent(event)
     
     def on_settings_changed(self):
         """Handle settings changes."""
-        # You can add any additional logic here when settings change
-        pass
+        self.execution_log.document().setMaximumBlockCount(
+            self.settings_manager.get('execution_log_lines', 100))
     
     def auto_run_daily_routine(self):
         """Auto-run the daily routine if configured."""
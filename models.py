@@ -1,11 +1,46 @@
 """
 Data models for DailyFlow routine management.
 """
-from typing import List, Dict, Any
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import json
+import mmap
 import os
+import re
+import sys
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Config files larger than this are stream-parsed when ijson is installed
+STREAMING_LOAD_THRESHOLD = 256 * 1024
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 
 class ActionType(Enum):
@@ -17,7 +52,11 @@ class ActionType(Enum):
     DO_NOT_DISTURB = "do_not_disturb"
 
 
-@dataclass
+# Plain dict lookup instead of ActionType(value) for every loaded action
+_ACTION_TYPE_LOOKUP: Dict[str, ActionType] = {t.value: t for t in ActionType}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Action:
     """Represents a single action in a routine."""
     action_type: ActionType
@@ -27,7 +66,7 @@ class Action:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Action':
         return cls(
-            action_type=ActionType(data['action_type']),
+            action_type=_ACTION_TYPE_LOOKUP[data['action_type']],
             parameters=data['parameters'],
             enabled=data.get('enabled', True)
         )
@@ -40,7 +79,7 @@ class Action:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Routine:
     """Represents a complete routine with multiple actions."""
     name: str
@@ -48,11 +87,22 @@ class Routine:
     actions: List[Action] = None
     scheduled_time: str = ""  # Format: "HH:MM"
     enabled: bool = True
+    # Bumped on every attribute assignment so serialized copies can be reused
+    _version: int = field(default=0, compare=False, repr=False)
     
     def __post_init__(self):
         if self.actions is None:
             self.actions = []
     
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name != '_version':
+            object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+    
+    def touch(self):
+        """Mark the routine as changed, e.g. after editing its actions in place."""
+        self._version += 1
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Routine':
         actions = [Action.from_dict(action_data) for action_data in data.get('actions', [])]
@@ -80,71 +130,177 @@ class RoutineManager:
     def __init__(self, config_file: str = "dailyflow_config.json"):
         self.config_file = config_file
         self.routines: List[Routine] = []
+        # Name index over self.routines for O(1) lookups
+        self._by_name: Dict[str, Routine] = {}
+        # Serialized form of each routine by id(), with the version it was built from
+        self._serial_cache: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        self._save_scheduler: Optional[Callable[[], None]] = None
         self.load_routines()
     
+    def set_save_scheduler(self, scheduler: Optional[Callable[[], None]]):
+        """Defer saves through scheduler, e.g. starting a debounce timer.
+        
+        The scheduler must eventually call save_routines(). With no
+        scheduler every change is written immediately.
+        """
+        self._save_scheduler = scheduler
+    
+    def _schedule_save(self):
+        """Save now, or hand off to the save scheduler if one is set."""
+        if self._save_scheduler is None:
+            self.save_routines()
+        else:
+            self._save_scheduler()
+    
     def add_routine(self, routine: Routine) -> bool:
         """Add a new routine. Returns False if name already exists."""
-        if any(r.name == routine.name for r in self.routines):
+        if routine.name in self._by_name:
             return False
         self.routines.append(routine)
-        self.save_routines()
+        self._by_name[routine.name] = routine
+        self._schedule_save()
         return True
     
     def update_routine(self, old_name: str, updated_routine: Routine) -> bool:
         """Update an existing routine."""
-        for i, routine in enumerate(self.routines):
-            if routine.name == old_name:
-                self.routines[i] = updated_routine
-                self.save_routines()
-                return True
-        return False
+        routine = self._by_name.pop(old_name, None)
+        if routine is None:
+            return False
+        
+        # The editor usually updates the stored routine in place
+        if updated_routine is not routine:
+            self.routines[self.routines.index(routine)] = updated_routine
+            self._serial_cache.pop(id(routine), None)
+        self._by_name[updated_routine.name] = updated_routine
+        updated_routine.touch()
+        self._schedule_save()
+        return True
     
     def delete_routine(self, name: str) -> bool:
         """Delete a routine by name."""
-        for i, routine in enumerate(self.routines):
-            if routine.name == name:
-                del self.routines[i]
-                self.save_routines()
-                return True
-        return False
+        routine = self._by_name.pop(name, None)
+        if routine is None:
+            return False
+        
+        self.routines.remove(routine)
+        self._serial_cache.pop(id(routine), None)
+        self._schedule_save()
+        return True
     
     def get_routine(self, name: str) -> Routine:
         """Get a routine by name."""
-        for routine in self.routines:
-            if routine.name == name:
-                return routine
-        return None
+        return self._by_name.get(name)
+    
+    def has_routine(self, name: str) -> bool:
+        """Check whether a routine with this name exists."""
+        return name in self._by_name
+    
+    def unique_name(self, base: str) -> str:
+        """Get base, or "base N" with the lowest N that is not taken."""
+        pattern = re.compile(rf'{re.escape(base)}(?: ([1-9][0-9]*))?')
+        used = set()
+        for name in self._by_name:
+            match = pattern.fullmatch(name)
+            if match:
+                used.add(int(match.group(1) or 0))
+        
+        counter = 0
+        while counter in used:
+            counter += 1
+        return f"{base} {counter}" if counter else base
+    
+    def is_empty(self) -> bool:
+        """Check whether there are no routines."""
+        return not self.routines
     
     def get_all_routines(self) -> List[Routine]:
         """Get all routines."""
         return self.routines.copy()
     
+    def iter_routines(self) -> Iterator[Routine]:
+        """Iterate over all routines without copying the list.
+        
+        Do not add or remove routines while iterating.
+        """
+        return iter(self.routines)
+    
     def save_routines(self):
-        """Save routines to JSON file."""
+        """Save routines to JSON file, replacing it atomically."""
+        routine_dicts = []
+        for routine in self.routines:
+            cached = self._serial_cache.get(id(routine))
+            if cached is None or cached[0] != routine._version:
+                cached = (routine._version, routine.to_dict())
+                self._serial_cache[id(routine)] = cached
+            routine_dicts.append(cached[1])
+        
         try:
-            data = {
-                'routines': [routine.to_dict() for routine in self.routines]
-            }
-            with open(self.config_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            data = _dumps({'routines': routine_dicts})
+            temp_file = self.config_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.config_file)
         except Exception as e:
             print(f"Error saving routines: {e}")
     
     def load_routines(self):
         """Load routines from JSON file."""
+        self._serial_cache.clear()
+        self.routines = self._read_routines()
+        self._by_name = {routine.name: routine for routine in self.routines}
+    
+    def _read_routines(self) -> List[Routine]:
+        """Parse routines from the JSON file."""
         if not os.path.exists(self.config_file):
-            self.routines = []
-            return
+            return []
         
         try:
-            with open(self.config_file, 'r') as f:
-                data = json.load(f)
-            
-            self.routines = [Routine.from_dict(routine_data) 
-                           for routine_data in data.get('routines', [])]
+            if ijson is not None and os.path.getsize(self.config_file) > STREAMING_LOAD_THRESHOLD:
+                routines = self._stream_routines()
+            else:
+                with open(self.config_file, 'rb') as f:
+                    data = _loads(f.read())
+                
+                routines = [Routine.from_dict(routine_data) 
+                            for routine_data in data.get('routines', [])]
         except Exception as e:
             print(f"Error loading routines: {e}")
-            self.routines = []
+            return []
+        
+        return routines
+    
+    def _stream_routines(self) -> List[Routine]:
+        """Parse routines one at a time from a memory-mapped config file.
+        
+        Only a single routine's dict is alive at once, instead of the whole
+        document plus a separate copy of the file contents.
+        """
+        with open(self.config_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return [Routine.from_dict(routine_data)
+                        for routine_data in ijson.items(mapped, 'routines.item', use_float=True)]
+
+
+def load_routine(name: str, config_file: str = "dailyflow_config.json") -> Optional[Routine]:
+    """Load a single routine by name, or None if it is missing.
+    
+    Used by CLI runs, which only need one routine: the other routines'
+    dicts are never turned into Routine and Action objects.
+    """
+    if not os.path.exists(config_file):
+        return None
+    
+    try:
+        with open(config_file, 'rb') as f:
+            data = _loads(f.read())
+    except Exception as e:
+        print(f"Error loading routines: {e}")
+        return None
+    
+    for routine_data in data.get('routines', []):
+        if routine_data.get('name') == name:
+            return Routine.from_dict(routine_data)
+    return None
 
 
 def create_sample_routine() -> Routine:
@@ -2,30 +2,92 @@
 Routine editor widget for creating and editing routines.
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
-                             QTextEdit, QLabel, QPushButton, QListWidget, 
-                             QListWidgetItem, QComboBox, QSpinBox, QTimeEdit,
+                             QTextEdit, QLabel, QPushButton, QListView,
+                             QComboBox, QSpinBox, QTimeEdit,
                              QCheckBox, QDialog, QDialogButtonBox, QFormLayout,
-                             QMessageBox, QGroupBox, QScrollArea, QFrame)
-from PySide6.QtCore import Qt, QTime, Signal
+                             QMessageBox, QGroupBox, QScrollArea, QFrame,
+                             QStackedWidget)
+from PySide6.QtCore import (Qt, QAbstractListModel, QModelIndex, QSignalBlocker,
+                            QTime, QTimer, Signal, Slot)
 from PySide6.QtGui import QFont
 from models import Routine, Action, ActionType
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Display text builders for the actions list, by action type
+_DISPLAY_FORMATTERS: Dict[ActionType, Callable[[Dict[str, Any]], str]] = {
+    ActionType.OPEN_APP: lambda params: f"Open App: {params.get('app_path', '')}",
+    ActionType.OPEN_WEBSITE: lambda params: f"Open Website: {params.get('url', '')}",
+    ActionType.SHOW_MESSAGE: lambda params: f"Show Message: {params.get('message', '')[:50]}...",
+    ActionType.PLAY_MUSIC: lambda params: f"Play Music: {params.get('url', params.get('command', ''))}",
+    ActionType.DELAY: lambda params: f"Wait {params.get('seconds', 0)} seconds",
+    ActionType.DO_NOT_DISTURB: lambda params: "Enable Do Not Disturb",
+}
+
+
+# Parameter inputs per action type: (row label, widget factory, attribute name,
+# setter calls). Tuple values are passed to the setter as separate arguments.
+_PARAM_SPECS: Dict[ActionType, List[Tuple[Optional[str], Callable[[], QWidget], Optional[str], Dict[str, Any]]]] = {
+    ActionType.OPEN_APP: [
+        ("Application Path:", QLineEdit, 'app_path_edit',
+         {'setPlaceholderText': "e.g., notepad.exe, C:\\Program Files\\...\\app.exe"}),
+    ],
+    ActionType.OPEN_WEBSITE: [
+        ("Website URL:", QLineEdit, 'url_edit',
+         {'setPlaceholderText': "e.g., https://gmail.com, youtube.com"}),
+    ],
+    ActionType.SHOW_MESSAGE: [
+        ("Title:", QLineEdit, 'message_title_edit',
+         {'setPlaceholderText': "Message Title (optional)", 'setText': "DailyFlow"}),
+        ("Message:", QTextEdit, 'message_text_edit',
+         {'setPlaceholderText': "Enter your message here...", 'setMaximumHeight': 100}),
+    ],
+    ActionType.PLAY_MUSIC: [
+        ("Music URL:", QLineEdit, 'music_url_edit',
+         {'setPlaceholderText': "e.g., https://open.spotify.com/playlist/..."}),
+        ("System Command:", QLineEdit, 'music_command_edit',
+         {'setPlaceholderText': "Or system command (optional)"}),
+    ],
+    ActionType.DELAY: [
+        ("Delay Duration:", QSpinBox, 'delay_spinbox',
+         {'setRange': (1, 3600), 'setValue': 5, 'setSuffix': " seconds"}),  # 1 second to 1 hour
+    ],
+    ActionType.DO_NOT_DISTURB: [
+        (None, QLabel, None,
+         {'setText': "This action will mute the system volume.",
+          'setStyleSheet': "color: #666; font-style: italic;"}),
+    ],
+}
 
 
 class ActionDialog(QDialog):
     """Dialog for creating/editing individual actions."""
     
+    # Action type combo entries, in display order
+    _ACTION_ITEMS: Tuple[Tuple[str, ActionType], ...] = (
+        ("Open Application", ActionType.OPEN_APP),
+        ("Open Website", ActionType.OPEN_WEBSITE),
+        ("Show Message", ActionType.SHOW_MESSAGE),
+        ("Play Music", ActionType.PLAY_MUSIC),
+        ("Delay/Wait", ActionType.DELAY),
+        ("Do Not Disturb", ActionType.DO_NOT_DISTURB),
+    )
+    _TYPE_TO_INDEX: Dict[ActionType, int] = {
+        action_type: i for i, (_, action_type) in enumerate(_ACTION_ITEMS)
+    }
+    # Parameter pages are stacked in _PARAM_SPECS order
+    _PAGE_INDEX: Dict[ActionType, int] = {
+        action_type: i for i, action_type in enumerate(_PARAM_SPECS)
+    }
+    
     def __init__(self, action: Optional[Action] = None, parent=None):
         super().__init__(parent)
         self.action = action
         self.init_ui()
-        
-        if action:
-            self.load_action(action)
+        self.set_action(action)
     
     def init_ui(self):
         """Initialize the dialog UI."""
-        self.setWindowTitle("Edit Action" if self.action else "New Action")
         self.setModal(True)
         self.resize(500, 400)
         
@@ -36,13 +98,9 @@ class ActionDialog(QDialog):
         
         # Action type selection
         self.action_type_combo = QComboBox()
-        self.action_type_combo.addItem("Open Application", ActionType.OPEN_APP)
-        self.action_type_combo.addItem("Open Website", ActionType.OPEN_WEBSITE)
-        self.action_type_combo.addItem("Show Message", ActionType.SHOW_MESSAGE)
-        self.action_type_combo.addItem("Play Music", ActionType.PLAY_MUSIC)
-        self.action_type_combo.addItem("Delay/Wait", ActionType.DELAY)
-        self.action_type_combo.addItem("Do Not Disturb", ActionType.DO_NOT_DISTURB)
-        self.action_type_combo.currentTextChanged.connect(self.on_action_type_changed)
+        for label, action_type in self._ACTION_ITEMS:
+            self.action_type_combo.addItem(label, action_type)
+        self.action_type_combo.currentTextChanged.connect(self.on_action_type_changed, Qt.ConnectionType.DirectConnection)
         form_layout.addRow("Action Type:", self.action_type_combo)
         
         # Enable checkbox
@@ -52,176 +110,294 @@ class ActionDialog(QDialog):
         
         layout.addLayout(form_layout)
         
-        # Parameters group
+        # Parameters group, with one page of inputs per action type
         self.params_group = QGroupBox("Parameters")
-        self.params_layout = QFormLayout(self.params_group)
+        params_layout = QVBoxLayout(self.params_group)
+        self.params_stack = QStackedWidget()
+        params_layout.addWidget(self.params_stack)
+        self.build_param_pages()
         layout.addWidget(self.params_group)
         
         # Dialog buttons
         button_box = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
         )
-        button_box.accepted.connect(self.accept)
-        button_box.rejected.connect(self.reject)
+        button_box.accepted.connect(self.accept, Qt.ConnectionType.DirectConnection)
+        button_box.rejected.connect(self.reject, Qt.ConnectionType.DirectConnection)
         layout.addWidget(button_box)
         
         # Initialize parameters for first action type
         self.on_action_type_changed()
     
+    def add_param_page(self) -> QFormLayout:
+        """Add an empty parameters page to the stack."""
+        page = QWidget()
+        self.params_stack.addWidget(page)
+        return QFormLayout(page)
+    
+    def build_param_pages(self):
+        """Build the parameter inputs for every action type once."""
+        for specs in _PARAM_SPECS.values():
+            page_layout = self.add_param_page()
+            for label, factory, attr_name, setup in specs:
+                widget = factory()
+                self._apply_setup(widget, setup)
+                if attr_name:
+                    setattr(self, attr_name, widget)
+                
+                if label:
+                    page_layout.addRow(label, widget)
+                else:
+                    page_layout.addRow(widget)
+    
+    @staticmethod
+    def _apply_setup(widget: QWidget, setup: Dict[str, Any]):
+        """Call a spec's setters on its widget."""
+        for setter, args in setup.items():
+            getattr(widget, setter)(*args if isinstance(args, tuple) else (args,))
+    
+    def reset_params(self):
+        """Put every parameter input back to its initial state."""
+        for specs in _PARAM_SPECS.values():
+            for _, _, attr_name, setup in specs:
+                if not attr_name:
+                    continue
+                widget = getattr(self, attr_name)
+                if isinstance(widget, (QLineEdit, QTextEdit)):
+                    widget.clear()
+                self._apply_setup(widget, setup)
+    
+    def set_action(self, action: Optional[Action]):
+        """Prepare the dialog for a new action (None) or an existing one."""
+        self.action = action
+        self.setWindowTitle("Edit Action" if action else "New Action")
+        self.reset_params()
+        
+        if action:
+            self.load_action(action)
+        else:
+            self.action_type_combo.setCurrentIndex(0)
+            self.enabled_checkbox.setChecked(True)
+    
+    @Slot()
     def on_action_type_changed(self):
         """Handle action type change."""
-        # Clear existing parameter widgets
-        while self.params_layout.count():
-            child = self.params_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        action_type = self.action_type_combo.currentData()
-        
-        if action_type == ActionType.OPEN_APP:
-            self.app_path_edit = QLineEdit()
-            self.app_path_edit.setPlaceholderText("e.g., notepad.exe, C:\\Program Files\\...\\app.exe")
-            self.params_layout.addRow("Application Path:", self.app_path_edit)
-            
-        elif action_type == ActionType.OPEN_WEBSITE:
-            self.url_edit = QLineEdit()
-            self.url_edit.setPlaceholderText("e.g., https://gmail.com, youtube.com")
-            self.params_layout.addRow("Website URL:", self.url_edit)
-            
-        elif action_type == ActionType.SHOW_MESSAGE:
-            self.message_title_edit = QLineEdit()
-            self.message_title_edit.setPlaceholderText("Message Title (optional)")
-            self.message_title_edit.setText("DailyFlow")
-            self.params_layout.addRow("Title:", self.message_title_edit)
-            
-            self.message_text_edit = QTextEdit()
-            self.message_text_edit.setPlaceholderText("Enter your message here...")
-            self.message_text_edit.setMaximumHeight(100)
-            self.params_layout.addRow("Message:", self.message_text_edit)
-            
-        elif action_type == ActionType.PLAY_MUSIC:
-            self.music_url_edit = QLineEdit()
-            self.music_url_edit.setPlaceholderText("e.g., https://open.spotify.com/playlist/...")
-            self.params_layout.addRow("Music URL:", self.music_url_edit)
-            
-            self.music_command_edit = QLineEdit()
-            self.music_command_edit.setPlaceholderText("Or system command (optional)")
-            self.params_layout.addRow("System Command:", self.music_command_edit)
-            
-        elif action_type == ActionType.DELAY:
-            self.delay_spinbox = QSpinBox()
-            self.delay_spinbox.setRange(1, 3600)  # 1 second to 1 hour
-            self.delay_spinbox.setValue(5)
-            self.delay_spinbox.setSuffix(" seconds")
-            self.params_layout.addRow("Delay Duration:", self.delay_spinbox)
-            
-        elif action_type == ActionType.DO_NOT_DISTURB:
-            info_label = QLabel("This action will mute the system volume.")
-            info_label.setStyleSheet("color: #666; font-style: italic;")
-            self.params_layout.addRow(info_label)
+        index = self._PAGE_INDEX.get(self.action_type_combo.currentData())
+        if index is not None:
+            self.params_stack.setCurrentIndex(index)
     
     def load_action(self, action: Action):
         """Load an existing action into the dialog."""
         # Set action type
-        for i in range(self.action_type_combo.count()):
-            if self.action_type_combo.itemData(i) == action.action_type:
-                self.action_type_combo.setCurrentIndex(i)
-                break
+        index = self._TYPE_TO_INDEX.get(action.action_type)
+        if index is not None:
+            self.action_type_combo.setCurrentIndex(index)
         
         # Set enabled state
         self.enabled_checkbox.setChecked(action.enabled)
         
         # Load parameters based on action type
-        params = action.parameters
-        
-        if action.action_type == ActionType.OPEN_APP:
-            if hasattr(self, 'app_path_edit'):
-                self.app_path_edit.setText(params.get('app_path', ''))
-                
-        elif action.action_type == ActionType.OPEN_WEBSITE:
-            if hasattr(self, 'url_edit'):
-                self.url_edit.setText(params.get('url', ''))
-                
-        elif action.action_type == ActionType.SHOW_MESSAGE:
-            if hasattr(self, 'message_title_edit'):
-                self.message_title_edit.setText(params.get('title', 'DailyFlow'))
-            if hasattr(self, 'message_text_edit'):
-                self.message_text_edit.setPlainText(params.get('message', ''))
-                
-        elif action.action_type == ActionType.PLAY_MUSIC:
-            if hasattr(self, 'music_url_edit'):
-                self.music_url_edit.setText(params.get('url', ''))
-            if hasattr(self, 'music_command_edit'):
-                self.music_command_edit.setText(params.get('command', ''))
-                
-        elif action.action_type == ActionType.DELAY:
-            if hasattr(self, 'delay_spinbox'):
-                self.delay_spinbox.setValue(params.get('seconds', 5))
+        loader = _PARAM_LOADERS.get(action.action_type)
+        if loader is not None:
+            loader(self, action.parameters)
     
     def get_action(self) -> Optional[Action]:
         """Get the action from the dialog inputs."""
         action_type = self.action_type_combo.currentData()
         enabled = self.enabled_checkbox.isChecked()
-        parameters = {}
         
         try:
-            if action_type == ActionType.OPEN_APP:
-                app_path = self.app_path_edit.text().strip()
-                if not app_path:
-                    QMessageBox.warning(self, "Invalid Input", "Application path is required.")
-                    return None
-                parameters['app_path'] = app_path
-                
-            elif action_type == ActionType.OPEN_WEBSITE:
-                url = self.url_edit.text().strip()
-                if not url:
-                    QMessageBox.warning(self, "Invalid Input", "Website URL is required.")
-                    return None
-                parameters['url'] = url
-                
-            elif action_type == ActionType.SHOW_MESSAGE:
-                title = self.message_title_edit.text().strip() or "DailyFlow"
-                message = self.message_text_edit.toPlainText().strip()
-                if not message:
-                    QMessageBox.warning(self, "Invalid Input", "Message text is required.")
-                    return None
-                parameters['title'] = title
-                parameters['message'] = message
-                
-            elif action_type == ActionType.PLAY_MUSIC:
-                url = self.music_url_edit.text().strip()
-                command = self.music_command_edit.text().strip()
-                if not url and not command:
-                    QMessageBox.warning(self, "Invalid Input", "Either music URL or system command is required.")
-                    return None
-                if url:
-                    parameters['url'] = url
-                if command:
-                    parameters['command'] = command
-                    
-            elif action_type == ActionType.DELAY:
-                seconds = self.delay_spinbox.value()
-                parameters['seconds'] = seconds
-                
-            elif action_type == ActionType.DO_NOT_DISTURB:
-                # No parameters needed
-                pass
+            getter = _PARAM_GETTERS.get(action_type, ActionDialog._get_no_params)
+            parameters = getter(self)
+            if parameters is None:
+                return None
             
             return Action(action_type, parameters, enabled)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to create action: {str(e)}")
             return None
+    
+    def _invalid_input(self, message: str) -> None:
+        """Warn about a missing input; returns None for the getters."""
+        QMessageBox.warning(self, "Invalid Input", message)
+        return None
+    
+    def _load_open_app(self, params: Dict[str, Any]):
+        """Load Open Application parameters."""
+        self.app_path_edit.setText(params.get('app_path', ''))
+    
+    def _load_open_website(self, params: Dict[str, Any]):
+        """Load Open Website parameters."""
+        self.url_edit.setText(params.get('url', ''))
+    
+    def _load_show_message(self, params: Dict[str, Any]):
+        """Load Show Message parameters."""
+        self.message_title_edit.setText(params.get('title', 'DailyFlow'))
+        self.message_text_edit.setPlainText(params.get('message', ''))
+    
+    def _load_play_music(self, params: Dict[str, Any]):
+        """Load Play Music parameters."""
+        self.music_url_edit.setText(params.get('url', ''))
+        self.music_command_edit.setText(params.get('command', ''))
+    
+    def _load_delay(self, params: Dict[str, Any]):
+        """Load Delay parameters."""
+        self.delay_spinbox.setValue(params.get('seconds', 5))
+    
+    def _get_open_app(self) -> Optional[Dict[str, Any]]:
+        """Read Open Application parameters."""
+        app_path = self.app_path_edit.text().strip()
+        if not app_path:
+            return self._invalid_input("Application path is required.")
+        return {'app_path': app_path}
+    
+    def _get_open_website(self) -> Optional[Dict[str, Any]]:
+        """Read Open Website parameters."""
+        url = self.url_edit.text().strip()
+        if not url:
+            return self._invalid_input("Website URL is required.")
+        return {'url': url}
+    
+    def _get_show_message(self) -> Optional[Dict[str, Any]]:
+        """Read Show Message parameters."""
+        title = self.message_title_edit.text().strip() or "DailyFlow"
+        message = self.message_text_edit.toPlainText().strip()
+        if not message:
+            return self._invalid_input("Message text is required.")
+        return {'title': title, 'message': message}
+    
+    def _get_play_music(self) -> Optional[Dict[str, Any]]:
+        """Read Play Music parameters."""
+        url = self.music_url_edit.text().strip()
+        command = self.music_command_edit.text().strip()
+        if not url and not command:
+            return self._invalid_input("Either music URL or system command is required.")
+        
+        parameters = {}
+        if url:
+            parameters['url'] = url
+        if command:
+            parameters['command'] = command
+        return parameters
+    
+    def _get_delay(self) -> Optional[Dict[str, Any]]:
+        """Read Delay parameters."""
+        return {'seconds': self.delay_spinbox.value()}
+    
+    def _get_no_params(self) -> Optional[Dict[str, Any]]:
+        """Read parameters for actions that take none, like Do Not Disturb."""
+        return {}
+
+
+# Fill the dialog inputs from an action's parameters, by action type
+_PARAM_LOADERS: Dict[ActionType, Callable[[ActionDialog, Dict[str, Any]], None]] = {
+    ActionType.OPEN_APP: ActionDialog._load_open_app,
+    ActionType.OPEN_WEBSITE: ActionDialog._load_open_website,
+    ActionType.SHOW_MESSAGE: ActionDialog._load_show_message,
+    ActionType.PLAY_MUSIC: ActionDialog._load_play_music,
+    ActionType.DELAY: ActionDialog._load_delay,
+}
+
+# Read and validate the dialog inputs, by action type; None means invalid
+_PARAM_GETTERS: Dict[ActionType, Callable[[ActionDialog], Optional[Dict[str, Any]]]] = {
+    ActionType.OPEN_APP: ActionDialog._get_open_app,
+    ActionType.OPEN_WEBSITE: ActionDialog._get_open_website,
+    ActionType.SHOW_MESSAGE: ActionDialog._get_show_message,
+    ActionType.PLAY_MUSIC: ActionDialog._get_play_music,
+    ActionType.DELAY: ActionDialog._get_delay,
+    ActionType.DO_NOT_DISTURB: ActionDialog._get_no_params,
+}
+
+
+class ActionListModel(QAbstractListModel):
+    """List model over a routine's actions.
+    
+    The model shares the routine's action list, and edits made through it
+    notify the view about the affected rows only.
+    """
+    
+    # Emitted after any edit to the shared action list
+    actions_edited = Signal()
+    
+    def __init__(self, display_text: Callable[[Action], str], parent=None):
+        super().__init__(parent)
+        self._display_text = display_text
+        self._actions: List[Action] = []
+    
+    def set_actions(self, actions: List[Action]):
+        """Show a new list of actions."""
+        self.beginResetModel()
+        self._actions = actions
+        self.endResetModel()
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of actions."""
+        return 0 if parent.isValid() else len(self._actions)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """Get the display text for an action row."""
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._display_text(self._actions[index.row()])
+        return None
+    
+    def append_action(self, action: Action):
+        """Append an action as a new last row."""
+        row = len(self._actions)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._actions.append(action)
+        self.endInsertRows()
+        self.actions_edited.emit()
+    
+    def replace_action(self, row: int, action: Action):
+        """Replace the action in a row."""
+        self._actions[row] = action
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        self.actions_edited.emit()
+    
+    def remove_action(self, row: int):
+        """Remove the action in a row."""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._actions[row]
+        self.endRemoveRows()
+        self.actions_edited.emit()
+    
+    def move_action(self, row: int, new_row: int):
+        """Swap an action with its neighbour at new_row."""
+        # Qt wants the destination as the row to insert before
+        destination = new_row if new_row < row else new_row + 1
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination)
+        self._actions[row], self._actions[new_row] = self._actions[new_row], self._actions[row]
+        self.endMoveRows()
+        self.actions_edited.emit()
 
 
 class RoutineEditor(QWidget):
     """Widget for editing routines."""
     
-    routine_changed = Signal(Routine)
+    # (routine, proposed name); the name is left for the parent to validate
+    routine_changed = Signal(Routine, str)
+    # Emitted after routine_changed when the user explicitly saves
+    routine_saved = Signal(Routine)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_routine = None
+        # Display text by (action type, parameters), reused across list refreshes
+        self._display_cache: Dict[Tuple, str] = {}
+        # Built on first use and reused for every add/edit
+        self._action_dialog: Optional[ActionDialog] = None
+        # Whether the user changed the time since the routine was loaded
+        self._time_edited = False
+        
+        # Debounce form edits: each change restarts the timer, so a burst of
+        # keystrokes produces a single routine_changed emission
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(150)
+        self._emit_timer.timeout.connect(self._emit_routine_changed)
+        
         self.init_ui()
     
     def init_ui(self):
@@ -233,22 +409,22 @@ class RoutineEditor(QWidget):
         info_layout = QFormLayout(info_group)
         
         self.name_edit = QLineEdit()
-        self.name_edit.textChanged.connect(self.on_routine_data_changed)
+        self.name_edit.textChanged.connect(self.on_routine_data_changed, Qt.ConnectionType.DirectConnection)
         info_layout.addRow("Name:", self.name_edit)
         
         self.description_edit = QTextEdit()
         self.description_edit.setMaximumHeight(60)
-        self.description_edit.textChanged.connect(self.on_routine_data_changed)
+        self.description_edit.textChanged.connect(self.on_routine_data_changed, Qt.ConnectionType.DirectConnection)
         info_layout.addRow("Description:", self.description_edit)
         
         self.scheduled_time_edit = QTimeEdit()
         self.scheduled_time_edit.setDisplayFormat("HH:mm")
-        self.scheduled_time_edit.timeChanged.connect(self.on_routine_data_changed)
+        self.scheduled_time_edit.timeChanged.connect(self.on_scheduled_time_changed, Qt.ConnectionType.DirectConnection)
         info_layout.addRow("Scheduled Time:", self.scheduled_time_edit)
         
         self.enabled_checkbox = QCheckBox()
         self.enabled_checkbox.setChecked(True)
-        self.enabled_checkbox.stateChanged.connect(self.on_routine_data_changed)
+        self.enabled_checkbox.stateChanged.connect(self.on_routine_data_changed, Qt.ConnectionType.DirectConnection)
         info_layout.addRow("Enabled:", self.enabled_checkbox)
         
         layout.addWidget(info_group)
@@ -261,43 +437,46 @@ class RoutineEditor(QWidget):
         controls_layout = QHBoxLayout()
         
         self.add_action_button = QPushButton("➕ Add Action")
-        self.add_action_button.clicked.connect(self.add_action)
+        self.add_action_button.clicked.connect(self.add_action, Qt.ConnectionType.DirectConnection)
         controls_layout.addWidget(self.add_action_button)
         
         self.edit_action_button = QPushButton("✏️ Edit Action")
-        self.edit_action_button.clicked.connect(self.edit_action)
+        self.edit_action_button.clicked.connect(self.edit_action, Qt.ConnectionType.DirectConnection)
         self.edit_action_button.setEnabled(False)
         controls_layout.addWidget(self.edit_action_button)
         
         self.delete_action_button = QPushButton("🗑️ Delete Action")
-        self.delete_action_button.clicked.connect(self.delete_action)
+        self.delete_action_button.clicked.connect(self.delete_action, Qt.ConnectionType.DirectConnection)
         self.delete_action_button.setEnabled(False)
         controls_layout.addWidget(self.delete_action_button)
         
         controls_layout.addStretch()
         
         self.move_up_button = QPushButton("⬆️ Move Up")
-        self.move_up_button.clicked.connect(self.move_action_up)
+        self.move_up_button.clicked.connect(self.move_action_up, Qt.ConnectionType.DirectConnection)
         self.move_up_button.setEnabled(False)
         controls_layout.addWidget(self.move_up_button)
         
         self.move_down_button = QPushButton("⬇️ Move Down")
-        self.move_down_button.clicked.connect(self.move_action_down)
+        self.move_down_button.clicked.connect(self.move_action_down, Qt.ConnectionType.DirectConnection)
         self.move_down_button.setEnabled(False)
         controls_layout.addWidget(self.move_down_button)
         
         actions_layout.addLayout(controls_layout)
         
         # Actions list
-        self.actions_list = QListWidget()
-        self.actions_list.currentRowChanged.connect(self.on_action_selection_changed)
+        self._action_model = ActionListModel(self._item_text, self)
+        self._action_model.actions_edited.connect(self.on_actions_edited, Qt.ConnectionType.DirectConnection)
+        self.actions_list = QListView()
+        self.actions_list.setModel(self._action_model)
+        self.actions_list.selectionModel().currentRowChanged.connect(self.on_action_selection_changed, Qt.ConnectionType.DirectConnection)
         actions_layout.addWidget(self.actions_list)
         
         layout.addWidget(actions_group)
         
         # Apply button
         self.apply_button = QPushButton("💾 Save Changes")
-        self.apply_button.clicked.connect(self.save_routine)
+        self.apply_button.clicked.connect(self.save_routine, Qt.ConnectionType.DirectConnection)
         self.apply_button.setStyleSheet("""
             QPushButton {
                 background-color: #4CAF50;
@@ -315,100 +494,119 @@ class RoutineEditor(QWidget):
     
     def load_routine(self, routine: Routine):
         """Load a routine into the editor."""
+        self._emit_timer.stop()
         self.current_routine = routine
-        
-        # Load basic information
-        self.name_edit.setText(routine.name)
-        self.description_edit.setPlainText(routine.description)
-        self.enabled_checkbox.setChecked(routine.enabled)
-        
-        # Load scheduled time
-        if routine.scheduled_time:
-            time_parts = routine.scheduled_time.split(':')
-            if len(time_parts) == 2:
-                hour, minute = int(time_parts[0]), int(time_parts[1])
-                self.scheduled_time_edit.setTime(QTime(hour, minute))
+        self._display_cache.clear()
+        self._time_edited = False
+        
+        # Filling the form is one logical change, so no per-field change signals
+        with QSignalBlocker(self.name_edit), QSignalBlocker(self.description_edit), \
+                QSignalBlocker(self.enabled_checkbox), QSignalBlocker(self.scheduled_time_edit):
+            # Load basic information
+            self.name_edit.setText(routine.name)
+            self.description_edit.setPlainText(routine.description)
+            self.enabled_checkbox.setChecked(routine.enabled)
+            
+            # Load scheduled time
+            if routine.scheduled_time:
+                scheduled = QTime.fromString(routine.scheduled_time, "HH:mm")
+                if scheduled.isValid():
+                    self.scheduled_time_edit.setTime(scheduled)
         
         # Load actions
         self.load_actions()
     
     def load_actions(self):
         """Load actions into the list."""
-        self.actions_list.clear()
-        
-        if not self.current_routine:
-            return
-        
-        for i, action in enumerate(self.current_routine.actions):
-            item_text = self.get_action_display_text(action)
-            item = QListWidgetItem(item_text)
-            item.setData(Qt.ItemDataRole.UserRole, i)
-            
-            # Style disabled actions
-            if not action.enabled:
-                item.setText(f"[DISABLED] {item_text}")
-                
-            self.actions_list.addItem(item)
+        actions = self.current_routine.actions if self.current_routine else []
+        self._action_model.set_actions(actions)
+        self.on_action_selection_changed(self.actions_list.currentIndex())
+    
+    def _item_text(self, action: Action) -> str:
+        """Get the list text for an action, marking disabled ones."""
+        item_text = self.get_action_display_text(action)
+        
+        # Style disabled actions
+        if not action.enabled:
+            return f"[DISABLED] {item_text}"
+        return item_text
+    
+    def _get_dialog(self) -> ActionDialog:
+        """Get the shared action dialog, creating it on first use."""
+        if self._action_dialog is None:
+            self._action_dialog = ActionDialog(parent=self)
+        return self._action_dialog
+    
+    def _current_row(self) -> int:
+        """Get the selected row in the actions list, or -1."""
+        return self.actions_list.currentIndex().row()
+    
+    def _set_current_row(self, row: int):
+        """Select a row in the actions list and refresh the buttons."""
+        self.actions_list.setCurrentIndex(self._action_model.index(row))
+        # Moves keep the same current index, so no selection signal fires
+        self.on_action_selection_changed(self.actions_list.currentIndex())
     
     def get_action_display_text(self, action: Action) -> str:
         """Get display text for an action."""
-        if action.action_type == ActionType.OPEN_APP:
-            app_path = action.parameters.get('app_path', '')
-            return f"Open App: {app_path}"
-        elif action.action_type == ActionType.OPEN_WEBSITE:
-            url = action.parameters.get('url', '')
-            return f"Open Website: {url}"
-        elif action.action_type == ActionType.SHOW_MESSAGE:
-            message = action.parameters.get('message', '')[:50]
-            return f"Show Message: {message}..."
-        elif action.action_type == ActionType.PLAY_MUSIC:
-            url = action.parameters.get('url', action.parameters.get('command', ''))
-            return f"Play Music: {url}"
-        elif action.action_type == ActionType.DELAY:
-            seconds = action.parameters.get('seconds', 0)
-            return f"Wait {seconds} seconds"
-        elif action.action_type == ActionType.DO_NOT_DISTURB:
-            return "Enable Do Not Disturb"
-        return "Unknown Action"
-    
-    def on_action_selection_changed(self, current_row):
+        formatter = _DISPLAY_FORMATTERS.get(action.action_type)
+        if formatter is None:
+            return "Unknown Action"
+        
+        try:
+            key = (action.action_type, tuple(sorted(action.parameters.items())))
+            text = self._display_cache.get(key)
+        except TypeError:
+            # Unhashable parameter values are simply not cached
+            return formatter(action.parameters)
+        
+        if text is None:
+            text = self._display_cache[key] = formatter(action.parameters)
+        return text
+    
+    @Slot(QModelIndex, QModelIndex)
+    def on_action_selection_changed(self, current: QModelIndex, previous: QModelIndex = QModelIndex()):
         """Handle action selection change."""
+        current_row = current.row()
         has_selection = current_row >= 0
         self.edit_action_button.setEnabled(has_selection)
         self.delete_action_button.setEnabled(has_selection)
         self.move_up_button.setEnabled(has_selection and current_row > 0)
         self.move_down_button.setEnabled(
-            has_selection and current_row < self.actions_list.count() - 1
+            has_selection and current_row < self._action_model.rowCount() - 1
         )
     
+    @Slot()
     def add_action(self):
         """Add a new action."""
-        dialog = ActionDialog(parent=self)
+        dialog = self._get_dialog()
+        dialog.set_action(None)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             action = dialog.get_action()
             if action and self.current_routine:
-                self.current_routine.actions.append(action)
-                self.load_actions()
-                self.actions_list.setCurrentRow(len(self.current_routine.actions) - 1)
+                self._action_model.append_action(action)
+                self._set_current_row(len(self.current_routine.actions) - 1)
     
+    @Slot()
     def edit_action(self):
         """Edit the selected action."""
-        current_row = self.actions_list.currentRow()
+        current_row = self._current_row()
         if current_row < 0 or not self.current_routine:
             return
         
         action = self.current_routine.actions[current_row]
-        dialog = ActionDialog(action, parent=self)
+        dialog = self._get_dialog()
+        dialog.set_action(action)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             updated_action = dialog.get_action()
             if updated_action:
-                self.current_routine.actions[current_row] = updated_action
-                self.load_actions()
-                self.actions_list.setCurrentRow(current_row)
+                self._action_model.replace_action(current_row, updated_action)
+                self._set_current_row(current_row)
     
+    @Slot()
     def delete_action(self):
         """Delete the selected action."""
-        current_row = self.actions_list.currentRow()
+        current_row = self._current_row()
         if current_row < 0 or not self.current_routine:
             return
         
@@ -421,53 +619,83 @@ class RoutineEditor(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            del self.current_routine.actions[current_row]
-            self.load_actions()
+            self._action_model.remove_action(current_row)
+            self.on_action_selection_changed(self.actions_list.currentIndex())
     
+    @Slot()
     def move_action_up(self):
         """Move the selected action up."""
-        current_row = self.actions_list.currentRow()
+        current_row = self._current_row()
         if current_row <= 0 or not self.current_routine:
             return
         
-        # Swap actions
-        actions = self.current_routine.actions
-        actions[current_row], actions[current_row - 1] = actions[current_row - 1], actions[current_row]
-        
-        self.load_actions()
-        self.actions_list.setCurrentRow(current_row - 1)
+        self._action_model.move_action(current_row, current_row - 1)
+        self._set_current_row(current_row - 1)
     
+    @Slot()
     def move_action_down(self):
         """Move the selected action down."""
-        current_row = self.actions_list.currentRow()
+        current_row = self._current_row()
         if current_row < 0 or current_row >= len(self.current_routine.actions) - 1:
             return
         
-        # Swap actions
-        actions = self.current_routine.actions
-        actions[current_row], actions[current_row + 1] = actions[current_row + 1], actions[current_row]
-        
-        self.load_actions()
-        self.actions_list.setCurrentRow(current_row + 1)
+        self._action_model.move_action(current_row, current_row + 1)
+        self._set_current_row(current_row + 1)
     
+    @Slot()
+    def on_actions_edited(self):
+        """Mark the routine changed after its action list was edited in place."""
+        # In-place list edits do not bump the routine's version by themselves,
+        # so without this a save could reuse its stale serialized form
+        if self.current_routine:
+            self.current_routine.touch()
+    
+    @Slot()
+    def on_scheduled_time_changed(self):
+        """Handle an edit to the scheduled time."""
+        self._time_edited = True
+        self.on_routine_data_changed()
+    
+    @Slot()
     def on_routine_data_changed(self):
         """Handle routine data changes."""
-        # This method is called when basic routine info changes
-        pass
+        # Restarting the timer coalesces rapid edits into one emission
+        self._emit_timer.start()
+    
+    def flush_pending(self):
+        """Emit a debounced change right away, if one is waiting."""
+        if self._emit_timer.isActive():
+            self._emit_timer.stop()
+            self._emit_routine_changed()
     
+    @Slot()
     def save_routine(self):
         """Save the current routine changes."""
+        self._emit_timer.stop()
+        self._emit_routine_changed()
+        if self.current_routine:
+            self.routine_saved.emit(self.current_routine)
+    
+    def show_name(self, name: str):
+        """Show a name in the name field without reporting it as an edit."""
+        with QSignalBlocker(self.name_edit):
+            self.name_edit.setText(name)
+    
+    @Slot()
+    def _emit_routine_changed(self):
+        """Copy the form into the current routine and notify the parent."""
         if not self.current_routine:
             return
         
-        # Update routine with current form data
-        self.current_routine.name = self.name_edit.text().strip()
+        # Update routine with current form data; the name may be blank or
+        # taken, so it is only applied once the parent has validated it
         self.current_routine.description = self.description_edit.toPlainText().strip()
         self.current_routine.enabled = self.enabled_checkbox.isChecked()
         
-        # Update scheduled time
-        time = self.scheduled_time_edit.time()
-        self.current_routine.scheduled_time = time.toString("HH:mm")
+        # Unscheduled routines stay unscheduled until the time is edited
+        if self._time_edited:
+            time = self.scheduled_time_edit.time()
+            self.current_routine.scheduled_time = time.toString("HH:mm")
         
         # Emit signal to notify parent
-        self.routine_changed.emit(self.current_routine)
\ No newline at end of file
+        self.routine_changed.emit(self.current_routine, self.name_edit.text().strip())
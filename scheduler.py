@@ -2,36 +2,139 @@
 Scheduler integration for DailyFlow.
 Handles scheduling routines to run at specific times.
 """
+import csv
+import heapq
+import io
+import math
 import os
 import sys
 import subprocess
-from typing import List, Optional
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from models import Routine
 
 
+def next_occurrence(scheduled_time: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Get the next time an "HH:MM" schedule is due, or None if it is invalid."""
+    try:
+        hour, minute = (int(part) for part in scheduled_time.split(':'))
+        now = now or datetime.now()
+        due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    except ValueError:
+        return None
+    
+    if due <= now:
+        due += timedelta(days=1)
+    return due
+
+
+# Task Scheduler 2.0 constants
+_TASK_FOLDER = "DailyFlow"
+_TASK_TRIGGER_DAILY = 2
+_TASK_ACTION_EXEC = 0
+_TASK_CREATE_OR_UPDATE = 6
+_TASK_LOGON_INTERACTIVE_TOKEN = 3
+
+# HRESULTs for ERROR_FILE_NOT_FOUND / ERROR_PATH_NOT_FOUND, raised when
+# deleting a task that does not exist
+_TASK_NOT_FOUND_HRESULTS = (0x80070002, 0x80070003)
+
+
+def _is_task_not_found(error: Exception) -> bool:
+    """Check whether a COM error means the task does not exist."""
+    hresult = getattr(error, 'hresult', None)
+    if hresult is None and error.args and isinstance(error.args[0], int):
+        hresult = error.args[0]
+    return hresult is not None and (hresult & 0xFFFFFFFF) in _TASK_NOT_FOUND_HRESULTS
+
+
 class SchedulerManager:
-    """Manages scheduling routines using Windows Task Scheduler."""
+    """Manages scheduling routines using Windows Task Scheduler.
+    
+    Tasks live in their own \\DailyFlow folder and are managed through the
+    Task Scheduler COM API, falling back to schtasks.exe when COM is
+    unavailable.
+    """
     
     def __init__(self):
         self.task_prefix = "DailyFlow_"
         self.app_path = os.path.abspath(sys.argv[0])
+        self._app_dir = os.path.dirname(self.app_path)
+        self._main_script = os.path.join(self._app_dir, "main.py")
+        # Connected on first use; False once the COM API has failed
+        self._task_folder = None
+        # Result of the availability probe, checked once per manager
+        self._available: Optional[bool] = None
+    
+    def _task_name(self, routine_name: str) -> str:
+        """Get the scheduled task name for a routine."""
+        return f"{self.task_prefix}{routine_name.replace(' ', '_')}"
+    
+    def _get_task_folder(self):
+        """Get the DailyFlow task folder through COM, or None if unavailable."""
+        if self._task_folder is None:
+            self._task_folder = False
+            if sys.platform == 'win32':
+                try:
+                    import comtypes.client
+                    service = comtypes.client.CreateObject("Schedule.Service", dynamic=True)
+                    service.Connect()
+                    try:
+                        folder = service.GetFolder(f"\\{_TASK_FOLDER}")
+                    except Exception:
+                        folder = service.GetFolder("\\").CreateFolder(_TASK_FOLDER)
+                    self._task_folder = (service, folder)
+                except Exception as e:
+                    print(f"Task Scheduler COM API unavailable, using schtasks: {e}")
+        return self._task_folder or None
+    
+    def _delete_task(self, folder, task_name: str):
+        """Delete a task from a COM task folder; a missing task is not an error."""
+        try:
+            folder.DeleteTask(task_name, 0)
+        except Exception as e:
+            if not _is_task_not_found(e):
+                raise
         
     def schedule_routine(self, routine: Routine) -> bool:
         """Schedule a routine to run at a specific time."""
         if not routine.scheduled_time:
             return False
         
-        task_name = f"{self.task_prefix}{routine.name.replace(' ', '_')}"
+        task_name = self._task_name(routine.name)
+        
+        # Run python on main.py directly rather than through a per-routine .bat
+        arguments = f'"{self._main_script}" --routine "{routine.name}"'
         
         try:
-            # Create a batch script to run the routine
-            script_path = self._create_runner_script(routine.name)
+            task_folder = self._get_task_folder()
+            if task_folder is not None:
+                service, folder = task_folder
+                definition = service.NewTask(0)
+                definition.RegistrationInfo.Description = f"Run the DailyFlow routine '{routine.name}'"
+                definition.Settings.Enabled = True
+                
+                trigger = definition.Triggers.Create(_TASK_TRIGGER_DAILY)
+                trigger.StartBoundary = f"{datetime.now():%Y-%m-%d}T{routine.scheduled_time}:00"
+                trigger.DaysInterval = 1
+                
+                action = definition.Actions.Create(_TASK_ACTION_EXEC)
+                action.Path = sys.executable
+                action.Arguments = arguments
+                action.WorkingDirectory = self._app_dir
+                
+                folder.RegisterTaskDefinition(task_name, definition, _TASK_CREATE_OR_UPDATE,
+                                              "", "", _TASK_LOGON_INTERACTIVE_TOKEN)
+                return True
             
-            # Create the scheduled task using schtasks
+            # Create the scheduled task using schtasks, which cannot set a
+            # working directory, so the command changes into the app folder
+            task_command = f'cmd /c cd /d "{self._app_dir}" && "{sys.executable}" {arguments}'
             cmd = [
                 'schtasks', '/create',
-                '/tn', task_name,
-                '/tr', f'"{script_path}"',
+                '/tn', f"\\{_TASK_FOLDER}\\{task_name}",
+                '/tr', task_command,
                 '/sc', 'daily',
                 '/st', routine.scheduled_time,
                 '/f'  # Force create/overwrite
@@ -46,17 +149,29 @@ class SchedulerManager:
     
     def unschedule_routine(self, routine_name: str) -> bool:
         """Remove a scheduled routine."""
-        task_name = f"{self.task_prefix}{routine_name.replace(' ', '_')}"
+        task_name = self._task_name(routine_name)
         
         try:
-            cmd = ['schtasks', '/delete', '/tn', task_name, '/f']
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Also remove the runner script
-            script_path = os.path.join(os.path.dirname(self.app_path), f"run_{routine_name.replace(' ', '_')}.bat")
+            # Older versions ran tasks through a per-routine .bat in the app
+            # folder; clean up any that are left over (kept for one release)
+            script_path = os.path.join(self._app_dir, f"run_{routine_name.replace(' ', '_')}.bat")
             if os.path.exists(script_path):
                 os.remove(script_path)
-                
+            
+            task_folder = self._get_task_folder()
+            if task_folder is not None:
+                service, folder = task_folder
+                self._delete_task(folder, task_name)
+                # Older versions registered tasks in the root folder
+                self._delete_task(service.GetFolder("\\"), task_name)
+                return True
+            
+            # Older versions registered tasks in the root folder; that task
+            # is usually gone, so its result is ignored
+            subprocess.run(['schtasks', '/delete', '/tn', f"\\{task_name}", '/f'],
+                           capture_output=True, text=True)
+            cmd = ['schtasks', '/delete', '/tn', f"\\{_TASK_FOLDER}\\{task_name}", '/f']
+            result = subprocess.run(cmd, capture_output=True, text=True)
             return result.returncode == 0
             
         except Exception as e:
@@ -76,84 +191,135 @@ class SchedulerManager:
     def get_scheduled_routines(self) -> List[str]:
         """Get list of currently scheduled routine names."""
         try:
-            cmd = ['schtasks', '/query', '/fo', 'csv']
+            task_folder = self._get_task_folder()
+            if task_folder is not None:
+                # Only our own folder is listed, not every task on the machine
+                tasks = task_folder[1].GetTasks(0)
+                task_names = [tasks.Item(i).Name for i in range(1, tasks.Count + 1)]
+                return [name[len(self.task_prefix):].replace('_', ' ')
+                        for name in task_names if name.startswith(self.task_prefix)]
+            
+            cmd = ['schtasks', '/query', '/fo', 'csv', '/nh']
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode != 0:
                 return []
             
-            scheduled_routines = []
-            for line in result.stdout.split('\\n')[1:]:  # Skip header
-                if line.strip() and self.task_prefix in line:
-                    # Extract task name and convert back to routine name
-                    task_name = line.split(',')[0].strip('"')
-                    if task_name.startswith(self.task_prefix):
-                        routine_name = task_name[len(self.task_prefix):].replace('_', ' ')
-                        scheduled_routines.append(routine_name)
+            # Task names are full paths, e.g. \DailyFlow\DailyFlow_Morning_Startup
+            prefix = f"\\{_TASK_FOLDER}\\{self.task_prefix}"
+            reader = csv.reader(io.StringIO(result.stdout))
+            scheduled_routines = [row[0][len(prefix):].replace('_', ' ')
+                                  for row in reader if row and row[0].startswith(prefix)]
             
-            return scheduled_routines
+            # A task with several triggers is listed once per trigger
+            return list(dict.fromkeys(scheduled_routines))
             
         except Exception as e:
             print(f"Error getting scheduled routines: {e}")
             return []
     
-    def _create_runner_script(self, routine_name: str) -> str:
-        """Create a batch script to run a specific routine."""
-        script_name = f"run_{routine_name.replace(' ', '_')}.bat"
-        script_path = os.path.join(os.path.dirname(self.app_path), script_name)
-        
-        # Get the directory of the main script
-        app_dir = os.path.dirname(self.app_path)
-        
-        # Create batch script content
-        script_content = f'''@echo off
-cd /d "{app_dir}"
-python main.py --routine "{routine_name}"
-'''
-        
-        try:
-            with open(script_path, 'w') as f:
-                f.write(script_content)
-            return script_path
-        except Exception as e:
-            print(f"Error creating runner script: {e}")
-            return ""
-    
     def is_task_scheduler_available(self) -> bool:
         """Check if Windows Task Scheduler is available."""
-        try:
-            result = subprocess.run(['schtasks', '/?'], capture_output=True)
-            return result.returncode == 0
-        except Exception:
-            return False
+        if self._available is None:
+            # A working COM connection answers without launching schtasks.exe
+            if self._get_task_folder():
+                self._available = True
+            else:
+                try:
+                    result = subprocess.run(['schtasks', '/?'], capture_output=True)
+                    self._available = result.returncode == 0
+                except Exception:
+                    self._available = False
+        return self._available
 
 
 class SimpleScheduler:
-    """Simple in-app scheduler for basic scheduling needs."""
+    """Simple in-app scheduler for basic scheduling needs.
+    
+    Pending runs are kept in a heap of (due time, name) and a single
+    single-shot timer sleeps until the earliest one, so an idle app only
+    wakes up when something has to run. Unscheduled or rescheduled
+    entries are left in the heap and skipped when they surface.
+    """
     
     def __init__(self):
+        # Imported here so the Task Scheduler code stays free of Qt
+        from PySide6.QtCore import Qt, QTimer
+        
         self.scheduled_routines = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._fire)
         
     def schedule_routine(self, routine: Routine, callback) -> bool:
         """Schedule a routine to run at a specific time (in-app only)."""
         if not routine.scheduled_time:
             return False
-            
-        # This would need to be implemented with QTimer for in-app scheduling
-        # For now, this is a placeholder for future enhancement
+        
+        next_run = next_occurrence(routine.scheduled_time)
+        if next_run is None:
+            return False
+        
+        due = next_run.timestamp()
         self.scheduled_routines[routine.name] = {
             'time': routine.scheduled_time,
-            'callback': callback
+            'callback': callback,
+            'due': due
         }
+        heapq.heappush(self._heap, (due, routine.name))
+        self._rearm()
         return True
     
     def unschedule_routine(self, routine_name: str) -> bool:
         """Remove a scheduled routine."""
         if routine_name in self.scheduled_routines:
             del self.scheduled_routines[routine_name]
+            self._rearm()
             return True
         return False
     
     def get_scheduled_routines(self) -> List[str]:
         """Get list of scheduled routine names."""
-        return list(self.scheduled_routines.keys())
\ No newline at end of file
+        return list(self.scheduled_routines.keys())
+    
+    def _is_current(self, due: float, name: str) -> bool:
+        """Check whether a heap entry still matches its routine's schedule."""
+        entry = self.scheduled_routines.get(name)
+        return entry is not None and entry['due'] == due
+    
+    def _rearm(self):
+        """Arm the timer for the earliest pending routine."""
+        while self._heap and not self._is_current(*self._heap[0]):
+            heapq.heappop(self._heap)
+        
+        self._timer.stop()
+        if not self._heap:
+            return
+        
+        # Round up so the timer never fires just before the due time
+        delay = self._heap[0][0] - time.time()
+        self._timer.start(max(0, math.ceil(delay * 1000)))
+    
+    def _fire(self):
+        """Run every routine that is due, then sleep until the next one."""
+        now = datetime.now()
+        due_entries = []
+        while self._heap and self._heap[0][0] <= now.timestamp():
+            due, name = heapq.heappop(self._heap)
+            if not self._is_current(due, name):
+                continue
+            
+            entry = self.scheduled_routines[name]
+            entry['due'] = next_occurrence(entry['time'], now).timestamp()
+            heapq.heappush(self._heap, (entry['due'], name))
+            due_entries.append(entry)
+        
+        self._rearm()
+        
+        for entry in due_entries:
+            try:
+                entry['callback']()
+            except Exception as e:
+                print(f"Error running scheduled routine: {e}")
@@ -3,10 +3,37 @@ Settings management for DailyFlow application.
 """
 import json
 import os
-import winreg
-from typing import Dict, Any
+import sys
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Per-user registry key whose values are launched at logon
+_RUN_KEY_PATH = "Software\\Microsoft\\Windows\\CurrentVersion\\Run"
+
+
+def _dumps(data: Any, readable: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if readable else 0)
+    if readable:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class Theme(Enum):
     LIGHT = "light"
@@ -16,30 +43,51 @@ class Theme(Enum):
     SUNSET = "sunset"
 
 
+# Themes by their stored setting value
+_VALUE_TO_THEME: Dict[str, Theme] = {theme.value: theme for theme in Theme}
+
+
+# Default values for every setting; copied by SettingsManager._default_settings
+_DEFAULT_SETTINGS: Dict[str, Any] = {
+    'run_on_startup': False,
+    'auto_run_daily_routine': False,
+    'default_routine_name': '',
+    'theme': Theme.LIGHT.value,
+    'window_size': {'width': 1200, 'height': 700},
+    'window_position': {'x': 100, 'y': 100},
+    'show_notifications': True,
+    'minimize_to_tray': False,
+    'execution_log_lines': 100,
+    'auto_save_interval': 30,
+    'confirm_routine_deletion': True,
+    'show_welcome_message': True,
+    # Also makes save_settings write indented, readable JSON
+    'debug_mode': False
+}
+
+
 class SettingsManager:
     """Manages application settings and preferences."""
     
     def __init__(self, settings_file: str = "dailyflow_settings.json"):
         self.settings_file = settings_file
         self.settings = self._default_settings()
+        # Inside batch_updates(), set() only marks the settings dirty
+        self._batching = 0
+        self._dirty = False
+        # Whether the Run registry entry exists; probed on first use
+        self._startup_cache: Optional[bool] = None
+        # Open Run key handles by access mode, reused until close()
+        self._run_keys: Dict[int, Any] = {}
+        app_path = os.path.abspath(sys.argv[0] or "main.py")
+        self._startup_command = f'"{sys.executable}" "{app_path}"'
         self.load_settings()
     
     def _default_settings(self) -> Dict[str, Any]:
         """Get default settings."""
-        return {
-            'run_on_startup': False,
-            'auto_run_daily_routine': False,
-            'default_routine_name': '',
-            'theme': Theme.LIGHT.value,
-            'window_size': {'width': 1200, 'height': 700},
-            'window_position': {'x': 100, 'y': 100},
-            'show_notifications': True,
-            'minimize_to_tray': False,
-            'execution_log_lines': 100,
-            'auto_save_interval': 30,
-            'confirm_routine_deletion': True,
-            'show_welcome_message': True
-        }
+        # Nested dicts are copied too, so callers never share the template's
+        return {key: value.copy() if isinstance(value, dict) else value
+                for key, value in _DEFAULT_SETTINGS.items()}
     
     def load_settings(self):
         """Load settings from JSON file."""
@@ -47,22 +95,26 @@ class SettingsManager:
             return
         
         try:
-            with open(self.settings_file, 'r') as f:
-                saved_settings = json.load(f)
+            with open(self.settings_file, 'rb') as f:
+                saved_settings = _loads(f.read())
+            
+            # Merge with defaults to ensure all keys exist; unknown keys are dropped
+            self.settings.update(
+                {key: saved_settings[key] for key in self.settings.keys() & saved_settings.keys()})
             
-            # Merge with defaults to ensure all keys exist
-            for key, value in saved_settings.items():
-                if key in self.settings:
-                    self.settings[key] = value
-                    
         except Exception as e:
             print(f"Error loading settings: {e}")
     
     def save_settings(self):
-        """Save settings to JSON file."""
+        """Save settings to JSON file, replacing it atomically."""
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            # Compact output unless debugging, when a readable file helps
+            data = _dumps(self.settings, readable=bool(self.settings.get('debug_mode')))
+            
+            temp_file = self.settings_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.settings_file)
         except Exception as e:
             print(f"Error saving settings: {e}")
     
@@ -73,14 +125,29 @@ class SettingsManager:
     def set(self, key: str, value: Any):
         """Set a setting value and save."""
         self.settings[key] = value
-        self.save_settings()
+        if self._batching:
+            self._dirty = True
+        else:
+            self.save_settings()
+    
+    @contextmanager
+    def batch_updates(self):
+        """Group several set() calls into a single save at the end."""
+        self._batching += 1
+        try:
+            yield self
+        finally:
+            self._batching -= 1
+            if not self._batching and self._dirty:
+                self._dirty = False
+                self.save_settings()
     
     def get_theme(self) -> Theme:
         """Get current theme."""
-        try:
-            return Theme(self.settings.get('theme', Theme.LIGHT.value))
-        except ValueError:
+        value = self.settings.get('theme')
+        if not isinstance(value, str):
             return Theme.LIGHT
+        return _VALUE_TO_THEME.get(value, Theme.LIGHT)
     
     def set_theme(self, theme: Theme):
         """Set the application theme."""
@@ -88,140 +155,173 @@ class SettingsManager:
     
     def set_startup_enabled(self, enabled: bool):
         """Enable/disable running on Windows startup."""
+        # Nothing to do when both the setting and the registry already agree
+        if self.settings.get('run_on_startup') == enabled and self.is_startup_enabled() == enabled:
+            return
+        
         self.set('run_on_startup', enabled)
+        if sys.platform != 'win32':
+            return
         
         if enabled:
             self._add_to_startup()
         else:
             self._remove_from_startup()
     
+    def _get_run_key(self, access: int):
+        """Get a handle to the current user's Run registry key, opened once."""
+        import winreg
+        
+        key = self._run_keys.get(access)
+        if key is None:
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, _RUN_KEY_PATH, 0, access)
+            self._run_keys[access] = key
+        return key
+    
+    def close(self):
+        """Close the registry handles held by the manager."""
+        if not self._run_keys:
+            return
+        
+        import winreg
+        
+        for key in self._run_keys.values():
+            winreg.CloseKey(key)
+        self._run_keys.clear()
+    
+    def __del__(self):
+        """Release the registry handles when the manager is collected."""
+        try:
+            self.close()
+        except Exception:
+            pass  # Interpreter shutdown may already have torn down winreg
+    
     def _add_to_startup(self):
         """Add DailyFlow to Windows startup."""
+        import winreg
+        
         try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                               "Software\\Microsoft\\Windows\\CurrentVersion\\Run", 
-                               0, winreg.KEY_SET_VALUE)
-            
-            app_path = os.path.abspath("main.py")
-            python_path = os.path.join(os.path.dirname(app_path), "python.exe")
-            startup_command = f'"{python_path}" "{app_path}"'
-            
-            winreg.SetValueEx(key, "DailyFlow", 0, winreg.REG_SZ, startup_command)
-            winreg.CloseKey(key)
+            key = self._get_run_key(winreg.KEY_SET_VALUE)
+            winreg.SetValueEx(key, "DailyFlow", 0, winreg.REG_SZ, self._startup_command)
+            self._startup_cache = True
             
         except Exception as e:
             print(f"Failed to add to startup: {e}")
     
     def _remove_from_startup(self):
         """Remove DailyFlow from Windows startup."""
+        import winreg
+        
         try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                               "Software\\Microsoft\\Windows\\CurrentVersion\\Run", 
-                               0, winreg.KEY_SET_VALUE)
-            
-            winreg.DeleteValue(key, "DailyFlow")
-            winreg.CloseKey(key)
+            winreg.DeleteValue(self._get_run_key(winreg.KEY_SET_VALUE), "DailyFlow")
+            self._startup_cache = False
             
         except FileNotFoundError:
-            pass  # Key doesn't exist, which is fine
+            self._startup_cache = False  # Value doesn't exist, which is fine
         except Exception as e:
             print(f"Failed to remove from startup: {e}")
     
     def is_startup_enabled(self) -> bool:
         """Check if DailyFlow is set to run on startup."""
+        if self._startup_cache is not None:
+            return self._startup_cache
+        if sys.platform != 'win32':
+            return False
+        
+        import winreg
+        
         try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                               "Software\\Microsoft\\Windows\\CurrentVersion\\Run", 
-                               0, winreg.KEY_READ)
-            
-            winreg.QueryValueEx(key, "DailyFlow")
-            winreg.CloseKey(key)
-            return True
-            
+            winreg.QueryValueEx(self._get_run_key(winreg.KEY_READ), "DailyFlow")
+            self._startup_cache = True
         except FileNotFoundError:
-            return False
+            self._startup_cache = False
         except Exception:
             return False
+        return self._startup_cache
 
 
-def get_theme_styles(theme: Theme) -> Dict[str, str]:
-    """Get CSS styles for different themes."""
-    
-    styles = {
-        Theme.LIGHT: {
-            'main_bg': '#ffffff',
-            'panel_bg': '#f8f9fa',
-            'text_color': '#212529',
-            'button_primary': '#4CAF50',
-            'button_primary_hover': '#45a049',
-            'button_secondary': '#2196F3',
-            'button_secondary_hover': '#1976D2',
-            'button_danger': '#f44336',
-            'button_danger_hover': '#d32f2f',
-            'border_color': '#dee2e6',
-            'log_bg': '#2b2b2b',
-            'log_text': '#ffffff'
-        },
-        
-        Theme.DARK: {
-            'main_bg': '#2b2b2b',
-            'panel_bg': '#3c3c3c',
-            'text_color': '#ffffff',
-            'button_primary': '#66BB6A',
-            'button_primary_hover': '#4CAF50',
-            'button_secondary': '#42A5F5',
-            'button_secondary_hover': '#2196F3',
-            'button_danger': '#EF5350',
-            'button_danger_hover': '#f44336',
-            'border_color': '#555555',
-            'log_bg': '#1a1a1a',
-            'log_text': '#ffffff'
-        },
-        
-        Theme.FOREST: {
-            'main_bg': '#f1f8e9',
-            'panel_bg': '#e8f5e8',
-            'text_color': '#2e7d32',
-            'button_primary': '#388e3c',
-            'button_primary_hover': '#2e7d32',
-            'button_secondary': '#689f38',
-            'button_secondary_hover': '#558b2f',
-            'button_danger': '#d84315',
-            'button_danger_hover': '#bf360c',
-            'border_color': '#a5d6a7',
-            'log_bg': '#1b5e20',
-            'log_text': '#c8e6c9'
-        },
-        
-        Theme.OCEAN: {
-            'main_bg': '#e3f2fd',
-            'panel_bg': '#e1f5fe',
-            'text_color': '#01579b',
-            'button_primary': '#0288d1',
-            'button_primary_hover': '#0277bd',
-            'button_secondary': '#29b6f6',
-            'button_secondary_hover': '#0288d1',
-            'button_danger': '#e91e63',
-            'button_danger_hover': '#c2185b',
-            'border_color': '#81d4fa',
-            'log_bg': '#01579b',
-            'log_text': '#b3e5fc'
-        },
-        
-        Theme.SUNSET: {
-            'main_bg': '#fff3e0',
-            'panel_bg': '#ffe0b2',
-            'text_color': '#e65100',
-            'button_primary': '#ff9800',
-            'button_primary_hover': '#f57c00',
-            'button_secondary': '#ff5722',
-            'button_secondary_hover': '#e64a19',
-            'button_danger': '#d32f2f',
-            'button_danger_hover': '#c62828',
-            'border_color': '#ffcc02',
-            'log_bg': '#bf360c',
-            'log_text': '#ffccbc'
-        }
-    }
-    
-    return styles.get(theme, styles[Theme.LIGHT])
\ No newline at end of file
+# Colors for each theme, built once at import
+_THEME_STYLES: Dict[Theme, Mapping[str, str]] = {
+    Theme.LIGHT: MappingProxyType({
+        'main_bg': '#ffffff',
+        'panel_bg': '#f8f9fa',
+        'text_color': '#212529',
+        'button_primary': '#4CAF50',
+        'button_primary_hover': '#45a049',
+        'button_secondary': '#2196F3',
+        'button_secondary_hover': '#1976D2',
+        'button_danger': '#f44336',
+        'button_danger_hover': '#d32f2f',
+        'border_color': '#dee2e6',
+        'log_bg': '#2b2b2b',
+        'log_text': '#ffffff'
+    }),
+    
+    Theme.DARK: MappingProxyType({
+        'main_bg': '#2b2b2b',
+        'panel_bg': '#3c3c3c',
+        'text_color': '#ffffff',
+        'button_primary': '#66BB6A',
+        'button_primary_hover': '#4CAF50',
+        'button_secondary': '#42A5F5',
+        'button_secondary_hover': '#2196F3',
+        'button_danger': '#EF5350',
+        'button_danger_hover': '#f44336',
+        'border_color': '#555555',
+        'log_bg': '#1a1a1a',
+        'log_text': '#ffffff'
+    }),
+    
+    Theme.FOREST: MappingProxyType({
+        'main_bg': '#f1f8e9',
+        'panel_bg': '#e8f5e8',
+        'text_color': '#2e7d32',
+        'button_primary': '#388e3c',
+        'button_primary_hover': '#2e7d32',
+        'button_secondary': '#689f38',
+        'button_secondary_hover': '#558b2f',
+        'button_danger': '#d84315',
+        'button_danger_hover': '#bf360c',
+        'border_color': '#a5d6a7',
+        'log_bg': '#1b5e20',
+        'log_text': '#c8e6c9'
+    }),
+    
+    Theme.OCEAN: MappingProxyType({
+        'main_bg': '#e3f2fd',
+        'panel_bg': '#e1f5fe',
+        'text_color': '#01579b',
+        'button_primary': '#0288d1',
+        'button_primary_hover': '#0277bd',
+        'button_secondary': '#29b6f6',
+        'button_secondary_hover': '#0288d1',
+        'button_danger': '#e91e63',
+        'button_danger_hover': '#c2185b',
+        'border_color': '#81d4fa',
+        'log_bg': '#01579b',
+        'log_text': '#b3e5fc'
+    }),
+    
+    Theme.SUNSET: MappingProxyType({
+        'main_bg': '#fff3e0',
+        'panel_bg': '#ffe0b2',
+        'text_color': '#e65100',
+        'button_primary': '#ff9800',
+        'button_primary_hover': '#f57c00',
+        'button_secondary': '#ff5722',
+        'button_secondary_hover': '#e64a19',
+        'button_danger': '#d32f2f',
+        'button_danger_hover': '#c62828',
+        'border_color': '#ffcc02',
+        'log_bg': '#bf360c',
+        'log_text': '#ffccbc'
+    })
+}
+
+
+def get_theme_styles(theme: Theme) -> Mapping[str, str]:
+    """Get CSS styles for different themes.
+    
+    The styles are shared module-level mappings and cannot be modified.
+    """
+    return _THEME_STYLES.get(theme, _THEME_STYLES[Theme.LIGHT])
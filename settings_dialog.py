@@ -5,10 +5,66 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
                                QWidget, QLabel, QCheckBox, QComboBox, QPushButton,
                                QSpinBox, QGroupBox, QFormLayout, QMessageBox,
                                QSlider, QFrame)
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QSignalBlocker, Signal
 from PySide6.QtGui import QFont
 from settings import SettingsManager, Theme, get_theme_styles
-from typing import List
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+
+# Settings fields: (widget attribute, getter, setter, settings key, default)
+_FieldSpecs = Tuple[Tuple[str, str, str, str, Any], ...]
+
+# Static stylesheets, shared by every dialog instance
+_RESET_BUTTON_QSS = """
+    QPushButton {
+        background-color: #ff9800;
+        color: white;
+        border: none;
+        padding: 8px;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #f57c00;
+    }
+"""
+
+
+def _build_preview_stylesheet() -> str:
+    """Build the theme preview stylesheet, with one rule per theme.
+    
+    Rules select on the preview's "theme" property, so switching themes only
+    changes that property instead of installing a new stylesheet.
+    """
+    rules = ["""
+        QLabel#themePreview {
+            border: 2px solid #ccc;
+            border-radius: 5px;
+            padding: 20px;
+            background-color: #f0f0f0;
+        }
+    """]
+    for theme in Theme:
+        styles = get_theme_styles(theme)
+        rules.append(f"""
+        QLabel#themePreview[theme="{theme.value}"] {{
+            background-color: {styles['main_bg']};
+            color: {styles['text_color']};
+            border: 2px solid {styles['button_primary']};
+            border-radius: 8px;
+            padding: 15px;
+            font-weight: bold;
+        }}
+    """)
+    return "".join(rules)
+
+
+_PREVIEW_QSS = _build_preview_stylesheet()
+
+# Theme preview text, prepared once for every theme
+_PREVIEW_TEXT: Dict[Theme, str] = {
+    theme: f"✨ Theme: {theme.value.title()} ✨\\n🎨 Main Background\\n📝 Text Color\\n🔘 Buttons"
+    for theme in Theme
+}
 
 
 class SettingsDialog(QDialog):
@@ -17,10 +73,41 @@ class SettingsDialog(QDialog):
     theme_changed = Signal(Theme)
     settings_changed = Signal()
     
+    # Plain widget <-> setting mappings per tab; the startup option, default
+    # routine and theme need extra handling and are loaded/saved by hand
+    _GENERAL_FIELDS: _FieldSpecs = (
+        ('auto_run_routine_cb', 'isChecked', 'setChecked', 'auto_run_daily_routine', False),
+        ('show_notifications_cb', 'isChecked', 'setChecked', 'show_notifications', True),
+        ('minimize_to_tray_cb', 'isChecked', 'setChecked', 'minimize_to_tray', False),
+        ('show_welcome_cb', 'isChecked', 'setChecked', 'show_welcome_message', True),
+        ('confirm_deletion_cb', 'isChecked', 'setChecked', 'confirm_routine_deletion', True),
+    )
+    _APPEARANCE_FIELDS: _FieldSpecs = (
+        ('log_lines_spin', 'value', 'setValue', 'execution_log_lines', 100),
+    )
+    _ADVANCED_FIELDS: _FieldSpecs = (
+        ('auto_save_spin', 'value', 'setValue', 'auto_save_interval', 30),
+        ('debug_mode_cb', 'isChecked', 'setChecked', 'debug_mode', False),
+        ('action_delay_slider', 'value', 'setValue', 'action_extra_delay', 500),
+        ('party_mode_cb', 'isChecked', 'setChecked', 'party_mode', False),
+    )
+    
     def __init__(self, settings_manager: SettingsManager, routine_names: List[str], parent=None):
         super().__init__(parent)
         self.settings_manager = settings_manager
         self.routine_names = routine_names
+        # Tabs are built the first time they are shown: (title, build, load, save)
+        self._tabs: List[Tuple[str, Callable[[QWidget], None], Callable[[], None], Callable[[], None]]] = [
+            ("General", self.create_general_tab, self.load_general_settings,
+             self.save_general_settings),
+            ("Appearance", self.create_appearance_tab, self.load_appearance_settings,
+             self.save_appearance_settings),
+            ("Advanced", self.create_advanced_tab, self.load_advanced_settings,
+             self.save_advanced_settings),
+        ]
+        self._tab_built: Set[int] = set()
+        # Tenth of a second currently shown by the delay label
+        self._last_delay_bucket = -1
         self.init_ui()
         self.load_current_settings()
     
@@ -36,10 +123,11 @@ class SettingsDialog(QDialog):
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
         
-        # Create tabs
-        self.create_general_tab()
-        self.create_appearance_tab()
-        self.create_advanced_tab()
+        # Add empty tabs and fill in only the one being shown
+        for title, _, _, _ in self._tabs:
+            self.tab_widget.addTab(QWidget(), title)
+        self.ensure_tab(self.tab_widget.currentIndex())
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -58,9 +146,25 @@ class SettingsDialog(QDialog):
         
         layout.addLayout(button_layout)
     
-    def create_general_tab(self):
+    def ensure_tab(self, index: int) -> bool:
+        """Build a tab's widgets if that has not happened yet.
+        
+        Returns True if the tab was built by this call.
+        """
+        if index < 0 or index in self._tab_built:
+            return False
+        
+        self._tab_built.add(index)
+        self._tabs[index][1](self.tab_widget.widget(index))
+        return True
+    
+    def on_tab_changed(self, index: int):
+        """Build and fill a tab the first time it is shown."""
+        if self.ensure_tab(index):
+            self._tabs[index][2]()
+    
+    def create_general_tab(self, tab: QWidget):
         """Create the general settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Startup group
@@ -74,7 +178,8 @@ class SettingsDialog(QDialog):
         startup_layout.addRow("Auto-run daily routine when app starts:", self.auto_run_routine_cb)
         
         self.default_routine_combo = QComboBox()
-        self.default_routine_combo.addItems([""] + self.routine_names)
+        self.default_routine_combo.addItem("")
+        self.default_routine_combo.addItems(self.routine_names)
         startup_layout.addRow("Default routine to run:", self.default_routine_combo)
         
         layout.addWidget(startup_group)
@@ -98,11 +203,9 @@ class SettingsDialog(QDialog):
         layout.addWidget(notifications_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(tab, "General")
     
-    def create_appearance_tab(self):
+    def create_appearance_tab(self, tab: QWidget):
         """Create the appearance settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Theme group
@@ -126,15 +229,9 @@ class SettingsDialog(QDialog):
         
         # Theme preview
         self.theme_preview = QLabel("Theme preview will appear here")
+        self.theme_preview.setObjectName("themePreview")
         self.theme_preview.setMinimumHeight(100)
-        self.theme_preview.setStyleSheet("""
-            QLabel {
-                border: 2px solid #ccc;
-                border-radius: 5px;
-                padding: 20px;
-                background-color: #f0f0f0;
-            }
-        """)
+        self.theme_preview.setStyleSheet(_PREVIEW_QSS)
         theme_layout.addRow("Preview:", self.theme_preview)
         
         layout.addWidget(theme_group)
@@ -152,11 +249,9 @@ class SettingsDialog(QDialog):
         layout.addWidget(font_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(tab, "Appearance")
     
-    def create_advanced_tab(self):
+    def create_advanced_tab(self, tab: QWidget):
         """Create the advanced settings tab."""
-        tab = QWidget()
         layout = QVBoxLayout(tab)
         
         # Performance group
@@ -182,9 +277,7 @@ class SettingsDialog(QDialog):
         self.action_delay_slider.setRange(0, 5000)  # 0-5 seconds
         self.action_delay_slider.setValue(500)  # 0.5 seconds default
         self.delay_label = QLabel("0.5s")
-        self.action_delay_slider.valueChanged.connect(
-            lambda v: self.delay_label.setText(f"{v/1000:.1f}s")
-        )
+        self.action_delay_slider.valueChanged.connect(self.on_delay_changed)
         
         delay_layout = QHBoxLayout()
         delay_layout.addWidget(self.action_delay_slider)
@@ -205,58 +298,64 @@ class SettingsDialog(QDialog):
         
         reset_button = QPushButton("🔄 Reset All Settings to Default")
         reset_button.clicked.connect(self.reset_settings)
-        reset_button.setStyleSheet("""
-            QPushButton {
-                background-color: #ff9800;
-                color: white;
-                border: none;
-                padding: 8px;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background-color: #f57c00;
-            }
-        """)
+        reset_button.setStyleSheet(_RESET_BUTTON_QSS)
         reset_layout.addWidget(reset_button)
         
         layout.addWidget(reset_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(tab, "Advanced")
     
     def load_current_settings(self):
-        """Load current settings into the dialog."""
-        # General tab
+        """Load current settings into the tabs that have been built."""
+        for index in sorted(self._tab_built):
+            self._tabs[index][2]()
+    
+    def _load_fields(self, fields: _FieldSpecs):
+        """Copy stored settings into the widgets described by a field table."""
+        for attr_name, _, setter, key, default in fields:
+            getattr(getattr(self, attr_name), setter)(self.settings_manager.get(key, default))
+    
+    def _save_fields(self, fields: _FieldSpecs):
+        """Store the values of the widgets described by a field table."""
+        for attr_name, getter, _, key, _ in fields:
+            self.settings_manager.set(key, getattr(getattr(self, attr_name), getter)())
+    
+    def load_general_settings(self):
+        """Load current settings into the general tab."""
         self.run_on_startup_cb.setChecked(self.settings_manager.get('run_on_startup', False))
-        self.auto_run_routine_cb.setChecked(self.settings_manager.get('auto_run_daily_routine', False))
+        self._load_fields(self._GENERAL_FIELDS)
         
         default_routine = self.settings_manager.get('default_routine_name', '')
         if default_routine in self.routine_names:
             self.default_routine_combo.setCurrentText(default_routine)
-        
-        self.show_notifications_cb.setChecked(self.settings_manager.get('show_notifications', True))
-        self.minimize_to_tray_cb.setChecked(self.settings_manager.get('minimize_to_tray', False))
-        self.show_welcome_cb.setChecked(self.settings_manager.get('show_welcome_message', True))
-        self.confirm_deletion_cb.setChecked(self.settings_manager.get('confirm_routine_deletion', True))
-        
-        # Appearance tab
+    
+    def load_appearance_settings(self):
+        """Load current settings into the appearance tab."""
         current_theme = self.settings_manager.get_theme()
-        for i in range(self.theme_combo.count()):
-            if self.theme_combo.itemData(i) == current_theme:
-                self.theme_combo.setCurrentIndex(i)
-                break
-        
-        self.log_lines_spin.setValue(self.settings_manager.get('execution_log_lines', 100))
+        index = self.theme_combo.findData(current_theme)
+        if index >= 0:
+            # The preview is refreshed once below, not from the change signal
+            with QSignalBlocker(self.theme_combo):
+                self.theme_combo.setCurrentIndex(index)
         
-        # Advanced tab
-        self.auto_save_spin.setValue(self.settings_manager.get('auto_save_interval', 30))
-        self.debug_mode_cb.setChecked(self.settings_manager.get('debug_mode', False))
-        self.action_delay_slider.setValue(self.settings_manager.get('action_extra_delay', 500))
-        self.party_mode_cb.setChecked(self.settings_manager.get('party_mode', False))
+        self._load_fields(self._APPEARANCE_FIELDS)
         
         # Update theme preview
         self.update_theme_preview()
     
+    def load_advanced_settings(self):
+        """Load current settings into the advanced tab."""
+        self._load_fields(self._ADVANCED_FIELDS)
+    
+    def on_delay_changed(self, value: int):
+        """Update the delay label, only when the shown tenth of a second changes."""
+        bucket = value // 100
+        if bucket == self._last_delay_bucket:
+            return
+        
+        self._last_delay_bucket = bucket
+        self.delay_label.setText(f"{bucket / 10:.1f}s")
+    
     def on_theme_changed(self):
         """Handle theme change."""
         self.update_theme_preview()
@@ -265,20 +364,13 @@ class SettingsDialog(QDialog):
         """Update the theme preview."""
         current_theme = self.theme_combo.currentData()
         if current_theme:
-            styles = get_theme_styles(current_theme)
-            preview_text = f"Theme: {current_theme.value.title()}"
+            self.theme_preview.setText(_PREVIEW_TEXT[current_theme])
             
-            self.theme_preview.setText(f"✨ {preview_text} ✨\\n🎨 Main Background\\n📝 Text Color\\n🔘 Buttons")
-            self.theme_preview.setStyleSheet(f"""
-                QLabel {{
-                    background-color: {styles['main_bg']};
-                    color: {styles['text_color']};
-                    border: 2px solid {styles['button_primary']};
-                    border-radius: 8px;
-                    padding: 15px;
-                    font-weight: bold;
-                }}
-            """)
+            # Re-polish so the rule for the new theme property applies
+            self.theme_preview.setProperty("theme", current_theme.value)
+            style = self.theme_preview.style()
+            style.unpolish(self.theme_preview)
+            style.polish(self.theme_preview)
     
     def apply_settings(self):
         """Apply settings without closing dialog."""
@@ -291,35 +383,36 @@ class SettingsDialog(QDialog):
         self.accept()
     
     def save_settings(self):
-        """Save all settings."""
-        # General settings
-        self.settings_manager.set('auto_run_daily_routine', self.auto_run_routine_cb.isChecked())
+        """Save the settings shown in the tabs that have been built."""
+        # Write the file once, after every value has been updated
+        with self.settings_manager.batch_updates():
+            for index in sorted(self._tab_built):
+                self._tabs[index][3]()
+        
+        self.settings_changed.emit()
+    
+    def save_general_settings(self):
+        """Save the general tab's settings."""
+        self._save_fields(self._GENERAL_FIELDS)
         self.settings_manager.set('default_routine_name', self.default_routine_combo.currentText())
-        self.settings_manager.set('show_notifications', self.show_notifications_cb.isChecked())
-        self.settings_manager.set('minimize_to_tray', self.minimize_to_tray_cb.isChecked())
-        self.settings_manager.set('show_welcome_message', self.show_welcome_cb.isChecked())
-        self.settings_manager.set('confirm_routine_deletion', self.confirm_deletion_cb.isChecked())
         
-        # Appearance settings
+        # Handle startup setting (requires special handling)
+        if self.run_on_startup_cb.isChecked() != self.settings_manager.get('run_on_startup', False):
+            self.settings_manager.set_startup_enabled(self.run_on_startup_cb.isChecked())
+    
+    def save_appearance_settings(self):
+        """Save the appearance tab's settings."""
         new_theme = self.theme_combo.currentData()
         old_theme = self.settings_manager.get_theme()
         if new_theme != old_theme:
             self.settings_manager.set_theme(new_theme)
             self.theme_changed.emit(new_theme)
         
-        self.settings_manager.set('execution_log_lines', self.log_lines_spin.value())
-        
-        # Advanced settings
-        self.settings_manager.set('auto_save_interval', self.auto_save_spin.value())
-        self.settings_manager.set('debug_mode', self.debug_mode_cb.isChecked())
-        self.settings_manager.set('action_extra_delay', self.action_delay_slider.value())
-        self.settings_manager.set('party_mode', self.party_mode_cb.isChecked())
-        
-        # Handle startup setting (requires special handling)
-        if self.run_on_startup_cb.isChecked() != self.settings_manager.get('run_on_startup', False):
-            self.settings_manager.set_startup_enabled(self.run_on_startup_cb.isChecked())
-        
-        self.settings_changed.emit()
+        self._save_fields(self._APPEARANCE_FIELDS)
+    
+    def save_advanced_settings(self):
+        """Save the advanced tab's settings."""
+        self._save_fields(self._ADVANCED_FIELDS)
     
     def reset_settings(self):
         """Reset all settings to defaults."""